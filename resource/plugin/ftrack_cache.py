@@ -0,0 +1,194 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 ftrack
+import os
+import errno
+import json
+import time
+import logging
+import sqlite3
+import tempfile
+import threading
+
+
+logger = logging.getLogger('ftrack_connect_rv.cache')
+
+
+def get_cache_directory():
+    '''Get cache directory shared between RV sessions.
+
+    Will create the directory (recursively) if it does not exist.
+
+    Raise if the directory can not be created.
+    '''
+    try:
+        import appdirs  # Inline import to avoid RV crashing if not available.
+        user_data_dir = appdirs.user_data_dir('ftrack-connect', 'ftrack')
+        cache_directory = os.path.join(user_data_dir, 'cache', 'rv')
+    except Exception:
+        cache_directory = os.path.join(
+            tempfile.gettempdir(), 'ftrack-connect-rv-cache'
+        )
+
+    if not os.path.exists(cache_directory):
+        try:
+            os.makedirs(cache_directory)
+        except OSError as error:
+            if error.errno == errno.EEXIST and os.path.isdir(cache_directory):
+                pass
+            else:
+                raise
+
+    return cache_directory
+
+
+class PersistentCache(object):
+    '''Key value store persisted in an SQLite database.
+
+    Values are stored JSON encoded. Entries older than *ttl* seconds are
+    treated as missing and, when *max_entries* is set, the least recently
+    used entries are evicted once the store grows beyond it.
+
+    The store is safe to use from several threads and several RV processes
+    at once.
+    '''
+
+    def __init__(self, path, ttl=None, max_entries=None):
+        '''Initialise cache stored at *path*.'''
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=5, check_same_thread=False
+        )
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                'created REAL NOT NULL, accessed REAL NOT NULL)'
+            )
+
+    def get(self, key, default=None):
+        '''Return value stored for *key* or *default*.'''
+        return self.get_many([key]).get(key, default)
+
+    def get_many(self, keys):
+        '''Return mapping of the *keys* present in the cache to values.'''
+        keys = list(keys)
+        result = {}
+        if not keys:
+            return result
+
+        now = time.time()
+        try:
+            with self._lock, self._connection:
+                for offset in range(0, len(keys), 500):
+                    batch = keys[offset:offset + 500]
+                    rows = self._connection.execute(
+                        'SELECT key, value, created FROM cache '
+                        'WHERE key IN ({0})'.format(
+                            ', '.join('?' * len(batch))
+                        ),
+                        batch
+                    ).fetchall()
+
+                    for key, value, created in rows:
+                        if self.ttl is not None and now - created > self.ttl:
+                            continue
+                        result[key] = json.loads(value)
+
+                self._connection.executemany(
+                    'UPDATE cache SET accessed = ? WHERE key = ?',
+                    [(now, key) for key in result]
+                )
+        except (sqlite3.Error, ValueError):
+            logger.exception('Failed to read from cache {0}.'.format(self.path))
+
+        return result
+
+    def items(self):
+        '''Return mapping of all keys in the cache to values.'''
+        result = {}
+        now = time.time()
+        try:
+            with self._lock, self._connection:
+                rows = self._connection.execute(
+                    'SELECT key, value, created FROM cache'
+                ).fetchall()
+        except sqlite3.Error:
+            logger.exception('Failed to read from cache {0}.'.format(self.path))
+            return result
+
+        for key, value, created in rows:
+            if self.ttl is not None and now - created > self.ttl:
+                continue
+            try:
+                result[key] = json.loads(value)
+            except ValueError:
+                logger.warning('Ignoring invalid cache entry {0}.'.format(key))
+
+        return result
+
+    def set(self, key, value):
+        '''Store *value* for *key*.'''
+        self.set_many({key: value})
+
+    def set_many(self, mapping):
+        '''Store all key value pairs in *mapping*.'''
+        if not mapping:
+            return
+
+        now = time.time()
+        try:
+            with self._lock, self._connection:
+                self._connection.executemany(
+                    'INSERT OR REPLACE INTO cache '
+                    '(key, value, created, accessed) VALUES (?, ?, ?, ?)',
+                    [
+                        (key, json.dumps(value), now, now)
+                        for key, value in mapping.items()
+                    ]
+                )
+                self._evict(now)
+        except (sqlite3.Error, TypeError, ValueError):
+            logger.exception('Failed to write to cache {0}.'.format(self.path))
+
+    def remove(self, key):
+        '''Remove *key* from the cache.'''
+        self.remove_many([key])
+
+    def remove_many(self, keys):
+        '''Remove all *keys* from the cache.'''
+        try:
+            with self._lock, self._connection:
+                self._connection.executemany(
+                    'DELETE FROM cache WHERE key = ?', [(key,) for key in keys]
+                )
+        except sqlite3.Error:
+            logger.exception(
+                'Failed to remove from cache {0}.'.format(self.path)
+            )
+
+    def clear(self):
+        '''Remove all entries from the cache.'''
+        try:
+            with self._lock, self._connection:
+                self._connection.execute('DELETE FROM cache')
+        except sqlite3.Error:
+            logger.exception('Failed to clear cache {0}.'.format(self.path))
+
+    def _evict(self, now):
+        '''Remove expired entries and entries beyond *max_entries*.'''
+        if self.ttl is not None:
+            self._connection.execute(
+                'DELETE FROM cache WHERE created < ?', (now - self.ttl,)
+            )
+
+        if self.max_entries is not None:
+            self._connection.execute(
+                'DELETE FROM cache WHERE key IN ('
+                'SELECT key FROM cache ORDER BY accessed DESC '
+                'LIMIT -1 OFFSET ?)', (self.max_entries,)
+            )
@@ -0,0 +1,174 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 ftrack
+import os
+import json
+import time
+import logging
+import functools
+import threading
+import collections
+
+
+logger = logging.getLogger('ftrack_connect_rv.profiling')
+
+
+class Profiler(object):
+    '''Record durations and counts of named operations.
+
+    Statistics per name are always kept. When *trace* is enabled every
+    operation is also recorded as an event, keeping the last *max_events*,
+    so that a session can be written out as a Chrome trace.
+
+    The profiler is safe to use from several threads.
+    '''
+
+    def __init__(self, trace=False, max_events=100000):
+        '''Initialise profiler.'''
+        self.trace = trace
+        self.origin = time.time()
+
+        self._lock = threading.Lock()
+        self._statistics = {}
+        self._events = collections.deque(maxlen=max_events)
+
+    def record(self, name, start, duration, category='call'):
+        '''Record operation *name* started at *start* lasting *duration*.
+
+        *start* is a :func:`time.time` timestamp and *duration* is in seconds.
+        '''
+        with self._lock:
+            statistics = self._statistics.get(name)
+            if statistics is None:
+                statistics = self._statistics[name] = {
+                    'category': category,
+                    'count': 0,
+                    'total': 0.0,
+                    'min': duration,
+                    'max': duration,
+                }
+
+            statistics['count'] += 1
+            statistics['total'] += duration
+            statistics['min'] = min(statistics['min'], duration)
+            statistics['max'] = max(statistics['max'], duration)
+
+            if self.trace:
+                self._events.append((
+                    name, category, start, duration,
+                    threading.current_thread().ident
+                ))
+
+    def span(self, name, category='call'):
+        '''Return context manager recording its block as *name*.'''
+        return _Span(self, name, category)
+
+    def timed(self, name=None, category='call'):
+        '''Return decorator recording calls to a function.
+
+        Calls are recorded as *name*, defaulting to the function name.
+        '''
+        def decorator(function):
+            label = name or function.__name__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(label, category):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def add_request_hook(self, session):
+        '''Record every request *session* makes to the server.
+
+        A response hook is registered on the requests session used by the
+        ftrack_api *session*.
+        '''
+        def hook(response, *args, **kwargs):
+            duration = response.elapsed.total_seconds()
+            self.record(
+                'server round trip', time.time() - duration, duration,
+                category='server'
+            )
+
+        try:
+            session._request.hooks['response'].append(hook)
+        except Exception:
+            logger.exception('Failed to profile server round trips.')
+
+    def summary(self):
+        '''Return mapping of operation names to their statistics.'''
+        with self._lock:
+            result = {}
+            for name, statistics in self._statistics.items():
+                result[name] = dict(
+                    statistics,
+                    mean=statistics['total'] / statistics['count']
+                )
+
+        return result
+
+    def reset(self):
+        '''Remove all recorded statistics and events.'''
+        with self._lock:
+            self._statistics.clear()
+            self._events.clear()
+
+    def dump(self, path):
+        '''Write recorded events and statistics to *path* as a Chrome trace.
+
+        The file can be opened with chrome://tracing or Perfetto, statistics
+        are stored under otherData.
+        '''
+        with self._lock:
+            events = list(self._events)
+
+        pid = os.getpid()
+        trace = {
+            'traceEvents': [
+                {
+                    'name': name,
+                    'cat': category,
+                    'ph': 'X',
+                    'ts': int((start - self.origin) * 1e6),
+                    'dur': int(duration * 1e6),
+                    'pid': pid,
+                    'tid': thread,
+                }
+                for name, category, start, duration, thread in events
+            ],
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'origin': self.origin,
+                'summary': self.summary(),
+            },
+        }
+
+        with open(path, 'w') as file_object:
+            json.dump(trace, file_object)
+
+        return path
+
+
+class _Span(object):
+    '''Context manager recording the duration of its block.'''
+
+    __slots__ = ('profiler', 'name', 'category', 'start', 'clock')
+
+    def __init__(self, profiler, name, category):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+
+    def __enter__(self):
+        self.start = time.time()
+        self.clock = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(
+            self.name, self.start, time.perf_counter() - self.clock,
+            self.category
+        )
+        return False
@@ -7,6 +7,16 @@ import tempfile
 import base64
 import traceback
 import os
+import collections
+import bisect
+import math
+import shutil
+import hashlib
+import threading
+import time
+import socket
+import subprocess
+import concurrent.futures
 from uuid import uuid1 as uuid
 
 
@@ -19,6 +29,18 @@ import rv.rvui
 import rv.runtime
 import rv as rv
 
+import ftrack_cache
+import ftrack_profiling
+
+# Qt is only used to defer work to RV's event loop and is optional.
+try:
+    from PySide2 import QtCore
+except ImportError:
+    try:
+        from PySide6 import QtCore
+    except ImportError:
+        QtCore = None
+
 
 ftrack_connect_rv_logger_name = 'ftrack_connect_rv'
 
@@ -32,6 +54,7 @@ except Exception as error:
     logging.warning('Failed to Initialize logging.', error)
 
 logger = logging.getLogger(ftrack_connect_rv_logger_name)
+
 logger.debug('PY3 Enabled: {}'.format(os.environ.get('RV_PYTHON3', 'NOT SET')))
 logger.debug('Interpreter {}'.format(sys.executable))
 logger.debug('version {}'.format(sys.version_info))
@@ -59,20 +82,39 @@ dependencies_path = os.path.abspath(os.path.join(
     'dependencies.zip'
 ))
 
+# Unpacked dependencies are preferred over the zip when deployed next to the
+# plugin, as importing from a directory can use cached bytecode.
+if os.path.isdir(os.path.splitext(dependencies_path)[0]):
+    dependencies_path = os.path.splitext(dependencies_path)[0]
+
+# Only importing ftrack_api is deferred, appdirs is imported from the
+# dependencies to resolve the cache directory on import.
 logger.debug('Adding {} to PATH'.format(dependencies_path))
 sys.path.insert(0, dependencies_path)
 
 
-# Try import ftrack's new API.
-try:
-    import ftrack_api
-    from ftrack_api.symbol import ORIGIN_LOCATION_ID, SERVER_LOCATION_ID
+# ftrack's new API, imported on first use as importing it from the
+# dependencies is slow.
+ftrack_api = None
 
-except ImportError as e:
-    logger.error(
-        'No Ftrack API module found in {}'.format(dependencies_path)
-    )
-    raise
+
+def _importApi():
+    '''Return ftrack_api module, importing it from the dependencies.'''
+    global ftrack_api
+
+    if ftrack_api is None:
+        try:
+            import ftrack_api
+            import ftrack_api.symbol
+            import ftrack_api.exception
+
+        except ImportError:
+            logger.error(
+                'No Ftrack API module found in {}'.format(dependencies_path)
+            )
+            raise
+
+    return ftrack_api
 
 
 # Cache to keep track of filesystem path for components.
@@ -80,27 +122,415 @@ except ImportError as e:
 # during the entire session.
 componentFilesystemPaths = {}
 
+# Location each path in componentFilesystemPaths was resolved in and the ids
+# of all locations the component is available in, so that persisted paths
+# can be ranked again against the probed locations of a later session.
+componentPathLocations = {}
+
+# Maximum number of components resolved by a single batched query.
+COMPONENT_BATCH_SIZE = 100
+
+# Filesystem paths persisted between RV sessions, keyed by component id,
+# along with the location they were resolved in. Entries expire after a week
+# and are validated against the filesystem and the probed locations before
+# being used.
+COMPONENT_PATH_CACHE_TTL = 60 * 60 * 24 * 7
+COMPONENT_PATH_CACHE_SIZE = 50000
+
+try:
+    componentPathCache = ftrack_cache.PersistentCache(
+        os.path.join(
+            ftrack_cache.get_cache_directory(), 'component_paths.db'
+        ),
+        ttl=COMPONENT_PATH_CACHE_TTL,
+        max_entries=COMPONENT_PATH_CACHE_SIZE
+    )
+except Exception:
+    logger.exception('Failed to open persistent component path cache.')
+    componentPathCache = None
+
 sequenceSourceNode = None
 stackSourceNode = None
 layoutSourceNode = None
+gridSourceNode = None
 
-# Store references to annotation components being uploaded between methods.
+# Store references to annotation components being uploaded between methods,
+# mapping component id to the component, the path of its file and the hash
+# of its content. The component is None for components reused from an
+# earlier upload of the same content.
 annotation_components = {}
 
+# Maximum number of annotation components uploaded at the same time, unless
+# overridden by the uploadWorkers setting.
+UPLOAD_WORKERS = 4
+
+# Executor running uploads, created on first upload. Each worker thread uses
+# a session of its own.
+uploadExecutor = None
+
+# Number of uploads queued and completed since the queue was last idle.
+uploadCounts = {'total': 0, 'completed': 0}
+uploadCountsLock = threading.Lock()
+
+# Seconds after which an asynchronous api call is reported as timed out.
+API_CALL_TIMEOUT = 30
+
+# Executor running asynchronous api calls, created on first use. A single
+# worker is used so that the calls share one session of their own.
+apiExecutor = None
+
+# Sessions of threads other than RV's main thread, see _getSession.
+threadSessions = threading.local()
+
+# Widget URLs keyed by panel name, entity type, entity id and theme, mapped
+# to the URL and the time it was resolved. URLs are reused for
+# WIDGET_URL_TTL seconds and refreshed in the background once older than
+# WIDGET_URL_REFRESH seconds.
+WIDGET_URL_TTL = 60 * 30
+WIDGET_URL_REFRESH = 60 * 20
+
+widgetUrls = {}
+widgetUrlsRefreshing = set()
+widgetUrlsLock = threading.Lock()
+
+# Ids of asynchronous api calls not yet responded to.
+apiRequestsPending = set()
+apiRequestsLock = threading.Lock()
+
+# Annotated frames are exported by up to EXPORT_WORKERS rvio jobs running in
+# parallel, unless overridden by the exportWorkers setting. Each job
+# overlays a frameburn with EXPORT_OPTIONS.
+EXPORT_WORKERS = max(1, min((os.cpu_count() or 2) // 2, 8))
+EXPORT_OPTIONS = ['-overlay', 'frameburn', '0.8', '1.0', '30.0']
+
+# Executor running rvio jobs, created on first export.
+exportExecutor = None
+
+# Annotated frames are written as EXPORT_FORMAT, one of EXPORT_FORMATS, with
+# EXPORT_QUALITY (0-100, jpg and webp only) and scaled down to fit
+# EXPORT_MAX_RESOLUTION pixels, 0 to keep the source resolution. These can be
+# overridden by the exportFormat, exportQuality and exportMaxResolution
+# settings.
+EXPORT_FORMATS = ('jpg', 'webp', 'png')
+EXPORT_FORMAT = 'jpg'
+EXPORT_QUALITY = 80
+EXPORT_MAX_RESOLUTION = 1920
+
+# Frames are exported to EXPORT_DIRECTORY below the temporary directory and
+# removed once uploaded. Files left by earlier sessions are removed after
+# EXPORT_FILE_TTL seconds unless still queued for upload.
+EXPORT_DIRECTORY = 'ftrack-connect-rv-annotations'
+EXPORT_FILE_TTL = 60 * 60 * 24
+
+# Failed uploads are retried UPLOAD_RETRIES times, waiting
+# UPLOAD_RETRY_DELAY seconds doubled after every attempt.
+UPLOAD_RETRIES = 5
+UPLOAD_RETRY_DELAY = 2
+
+# Pending uploads persisted to disk, keyed by component id, so that uploads
+# interrupted by RV exiting are resumed by the next session. Entries are
+# dropped after three days.
+UPLOAD_QUEUE_TTL = 60 * 60 * 24 * 3
+
+try:
+    uploadQueue = ftrack_cache.PersistentCache(
+        os.path.join(ftrack_cache.get_cache_directory(), 'upload_queue.db'),
+        ttl=UPLOAD_QUEUE_TTL
+    )
+except Exception:
+    logger.exception('Failed to open persistent upload queue.')
+    uploadQueue = None
+
+# Components uploaded by earlier sessions, keyed by ftrack server and hash of
+# their content, so that frames exported again reuse the uploaded component
+# instead of uploading the same content again. Entries are dropped after
+# thirty days or once the component is no longer in the server location.
+UPLOAD_INDEX_TTL = 60 * 60 * 24 * 30
+UPLOAD_INDEX_SIZE = 10000
 
-# Initialize New API
 try:
-    session = ftrack_api.Session(
-        auto_connect_event_hub=False
+    uploadIndex = ftrack_cache.PersistentCache(
+        os.path.join(ftrack_cache.get_cache_directory(), 'upload_index.db'),
+        ttl=UPLOAD_INDEX_TTL, max_entries=UPLOAD_INDEX_SIZE
+    )
+except Exception:
+    logger.exception('Failed to open persistent upload index.')
+    uploadIndex = None
+
+# Number of playlist items added by the first idle step when loading
+# progressively, doubled for every following step so that the sequence is
+# rewired a logarithmic number of times.
+PROGRESSIVE_LOAD_BATCH_SIZE = 10
+
+# Component ids and source groups of the loaded playlist, in order.
+playlistSourceGroups = []
+
+# Playlist index of each loaded source group.
+playlistSourceGroupIndices = {}
+
+# Component ids of the loaded playlist as requested by the panels, which
+# differ from the loaded component ids for items loaded as proxies.
+playlistComponentIds = []
+
+# Playback quality used when not set by the playbackQuality setting, the
+# components requested are loaded unless proxies are opted into. In auto
+# mode playlists of at least PROXY_PLAYLIST_SIZE items are loaded as
+# proxies. Proxies are the components of the same version named after the
+# first of PROXY_COMPONENT_NAMES available, which can be overridden by the
+# comma separated proxyComponentNames setting.
+PLAYBACK_QUALITY = 'full'
+PROXY_PLAYLIST_SIZE = 20
+PROXY_COMPONENT_NAMES = ('proxy', 'ftrackreview-mp4-1080', 'ftrackreview-mp4')
+
+# Source groups created for comparing components, keyed by component id in
+# least recently used order. Up to COMPARE_CACHE_SIZE groups are kept alive
+# so that switching compare modes does not reload media.
+COMPARE_CACHE_SIZE = 8
+compareSourceGroups = collections.OrderedDict()
+
+# Grids of more than GRID_PROXY_TILES tiles load proxies when no quality is
+# requested, unless overridden by the gridProxyTiles setting.
+GRID_PROXY_TILES = 4
+
+# Requested component ids mapped to the proxy component id to load instead,
+# or None if the version has no accessible proxy, keyed by proxy component
+# names.
+proxyComponents = {}
+
+# Cumulative number of sequence frames before each playlist item, with the
+# total frame count as last entry, and frame counts of loaded source groups.
+playlistFrameOffsets = [0]
+sourceGroupFrameCounts = {}
+
+# Incremented for every playlist load so that pending progressive loads of a
+# previous playlist can be abandoned.
+playlistLoadId = 0
+
+# Media of the PREFETCH_ITEMS playlist items following the current one is
+# copied to a local media cache in the background, and their sources are
+# switched to the copy once complete. Only single file media is copied and
+# the cache is kept below MEDIA_CACHE_SIZE gigabytes by evicting the least
+# recently used copies. All can be overridden by settings.
+PREFETCH_ITEMS = 3
+PREFETCH_WORKERS = 2
+MEDIA_CACHE_SIZE = 20
+
+# Executor copying media, created on first use, and futures of the copies
+# in flight keyed by original path.
+mediaCacheExecutor = None
+mediaCacheFutures = {}
+
+# Number of items to prefetch, cache directory and maximum size in bytes,
+# read from the settings on first prefetch.
+mediaCacheSettings = None
+
+# Original paths mapped to their local copy, for copies made by this
+# session.
+mediaCachePaths = {}
+
+# Original paths of the media loaded by the playlist, of which local copies
+# can be in use by its sources.
+playlistMediaPaths = set()
+
+
+# Lower cased entity type aliases and ids mapped to schema ids, built from
+# the session schemas on first use.
+entityTypeIndex = None
+
+# Locations a component is available in are ordered by read latency, in
+# steps of LOCATION_LATENCY_RESOLUTION seconds, then by priority, which can
+# be overridden per location name by the locationPriorities setting. Only
+# locations with a filesystem prefix are probed, locations not responding
+# within LOCATION_PROBE_TIMEOUT seconds are treated as inaccessible.
+LOCATION_LATENCY_RESOLUTION = 0.005
+LOCATION_PROBE_TIMEOUT = 2.0
+
+# Accessible locations and their probed read latency, probed once per
+# session in the background. Locations are stored as the id, name and
+# priority of each, so that the latencies can be used with any session.
+# None until probed.
+locationLatencies = None
+locationLatenciesLock = threading.Lock()
+
+
+def _createSession():
+    '''Return new ftrack session.
+
+    Schemas are cached in the plugin cache directory, unless configured with
+    FTRACK_API_SCHEMA_CACHE_PATH, so they are only downloaded again when they
+    change on the server.
+
+    '''
+    schemaCachePath = os.environ.get('FTRACK_API_SCHEMA_CACHE_PATH')
+    if schemaCachePath is None:
+        try:
+            schemaCachePath = ftrack_cache.get_cache_directory()
+        except Exception:
+            logger.exception('Failed to get schema cache directory.')
+
+    session = _importApi().Session(
+        auto_connect_event_hub=False,
+        schema_cache_path=schemaCachePath
+    )
+    profiler.add_request_hook(session)
+
+    return session
+
+
+# Time the plugin started loading, startup steps are measured against it.
+startupTime = time.time()
+
+# Startup pipeline creating the session of RV's main thread while panel URLs
+# are resolved in the background. Panel URLs are keyed by panel name and
+# params.
+startupExecutor = None
+sessionFuture = None
+startupUrls = {}
+
+# Panels for which time to first load has been logged.
+loadedPanels = set()
+
+
+def _runStartupStep(name, function, *args):
+    '''Run startup step *name* calling *function* with *args* and log time.'''
+    start = time.time()
+    try:
+        return function(*args)
+    except Exception:
+        logger.exception('Startup step {0} failed.'.format(name))
+        raise
+    finally:
+        now = time.time()
+        profiler.record(
+            'startup {0}'.format(name), start, now - start, category='startup'
+        )
+        logger.info(
+            'Startup step {0} took {1:.3f}s, done {2:.3f}s after plugin '
+            'load.'.format(name, now - start, now - startupTime)
+        )
+
+
+def _startup():
+    '''Start creating the session and resolving panel URLs concurrently.
+
+    The session of RV's main thread is created while the URLs of both panels
+    for the params RV was started with are resolved by the api worker with
+    its own session, while RV builds its UI. Locations are probed by a
+    startup worker of their own, so that api calls do not wait on slow
+    mounts. Only the resulting URLs and latencies are handed to the main
+    thread.
+
+    '''
+    global startupExecutor
+    global sessionFuture
+
+    startupExecutor = concurrent.futures.ThreadPoolExecutor(max_workers=3)
+    sessionFuture = startupExecutor.submit(
+        _runStartupStep, 'session', _createSession
+    )
+    startupExecutor.submit(
+        _runStartupStep, 'location latencies', _getLocationLatencies
     )
+    startupExecutor.submit(
+        _runStartupStep, 'export cleanup', _cleanExportDirectory
+    )
+
+    try:
+        params = rv.commands.commandLineFlag('params', None)
+    except Exception:
+        params = None
+    params = params or 'None'
+
+    apiExecutor = _getApiExecutor()
+    for panelName in ('review_navigation', 'review_action'):
+        startupUrls[(panelName, params)] = apiExecutor.submit(
+            _runStartupStep, panelName, _generateURL, params, panelName
+        )
+
+
+def _getSession():
+    '''Return ftrack session of the current thread.
+
+    RV's main thread uses the session created by the startup pipeline,
+    waiting for it if needed. Sessions are not thread safe, so every other
+    thread creates its own.
+
+    '''
+    if threading.current_thread() is not threading.main_thread():
+        threadSession = getattr(threadSessions, 'session', None)
+        if threadSession is None:
+            threadSession = _createSession()
+            threadSessions.session = threadSession
+
+        return threadSession
+
+    if sessionFuture is None:
+        _startup()
+
+    return sessionFuture.result()
 
-    # Get some useful locations.
-    origin_location = session.get('Location', ORIGIN_LOCATION_ID)
-    server_location = session.get('Location', SERVER_LOCATION_ID)
 
-except Exception as e:
-    logger.error(e)
-    raise
+if QtCore is not None:
+    class _MainThreadDispatcher(QtCore.QObject):
+        '''Run callables on RV's main thread once control returns to Qt.'''
+
+        dispatched = QtCore.Signal(object)
+
+        def __init__(self):
+            super(_MainThreadDispatcher, self).__init__()
+            self.dispatched.connect(self._run, QtCore.Qt.QueuedConnection)
+
+        def _run(self, function):
+            try:
+                function()
+            except Exception:
+                logger.exception('Failed to run deferred call.')
+
+    _dispatcher = _MainThreadDispatcher()
+else:
+    _dispatcher = None
+
+
+def _callLater(function):
+    '''Run *function* on RV's main thread once the event loop is idle.
+
+    *function* can be scheduled from any thread. If Qt is not available it is
+    called immediately.
+
+    '''
+    if _dispatcher is None:
+        function()
+    else:
+        _dispatcher.dispatched.emit(function)
+
+
+def _readSetting(name, default):
+    '''Return ftrack RV setting *name* or *default* if not set.'''
+    try:
+        return rv.commands.readSettings('ftrack', name, default)
+    except Exception:
+        return default
+
+
+# Durations and counts of entry points and server round trips. Individual
+# calls are only traced when the profile setting is enabled.
+profiler = ftrack_profiling.Profiler(trace=bool(_readSetting('profile', False)))
+
+
+def _sendFtrackEvent(data):
+    '''Send *data* to the ftrack panels as an ftrack-event.'''
+    try:
+        rv.commands.sendInternalEvent(
+            'ftrack-event',
+            base64.b64encode(
+                json.dumps(data).encode("utf-8")
+            ).decode('ascii'),
+            None
+        )
+    except Exception:
+        logger.error(
+            'Could not send internal event to ftrack.'
+        )
 
 
 def _getSourceNode(nodeType='sequence'):
@@ -108,6 +538,7 @@ def _getSourceNode(nodeType='sequence'):
     global sequenceSourceNode
     global stackSourceNode
     global layoutSourceNode
+    global gridSourceNode
 
     if nodeType == 'sequence':
         if sequenceSourceNode is None:
@@ -145,188 +576,1559 @@ def _getSourceNode(nodeType='sequence'):
 
         return layoutSourceNode
 
+    elif nodeType == 'grid':
+        if gridSourceNode is None:
+            gridSourceNode = rv.commands.newNode(
+                'RVLayoutGroup', 'Grid'
+            )
+
+            rv.extra_commands.setUIName(
+                gridSourceNode, 'GridNode'
+            )
+            rv.commands.setStringProperty(
+                '{0}.layout.mode'.format(gridSourceNode), ['grid'], True
+            )
+
+        return gridSourceNode
+
 
 def _setWipeMode(state):
     '''Util to set the state of wipes instead of toggle.'''
-    if rv.runtime.eval('rvui.wipeShown()', ['rvui']) != -1 and state is False:
+    shown = str(rv.runtime.eval('rvui.wipeShown()', ['rvui'])).strip() != '-1'
+    if shown != state:
         rv.runtime.eval('rvui.toggleWipe()', ['rvui'])
 
-    if rv.runtime.eval('rvui.wipeShown()', ['rvui']) == -1 and state is True:
-        rv.runtime.eval('rvui.toggleWipe()', ['rvui'])
+
+def _pathExists(path):
+    '''Return whether *path* still exists on disk.
+
+    Image sequence paths such as ``/path/file.%04d.exr`` are considered to
+    exist if their directory does.
+
+    '''
+    if os.path.exists(path):
+        return True
+
+    if '%' in os.path.basename(path):
+        return os.path.isdir(os.path.dirname(path))
+
+    return False
+
+
+def _loadPersistedFilePaths(componentIds):
+    '''Populate `componentFilesystemPaths` from the persistent cache.
+
+    Only *componentIds* not already known in this session are looked up.
+    Persisted paths that no longer exist, or that were resolved in another
+    location than the fastest one the component is available in, are
+    invalidated.
+
+    '''
+    global componentFilesystemPaths
+
+    if componentPathCache is None:
+        return
+
+    unknown = [
+        componentId for componentId in componentIds
+        if componentId and componentId not in componentFilesystemPaths
+    ]
+    if not unknown:
+        return
+
+    ranked = [locationId for locationId, _, _, _ in _getRankedLocations()]
+
+    stale = []
+    for componentId, entry in componentPathCache.get_many(unknown).items():
+        try:
+            path = entry['path']
+            locationId = entry['location']
+            available = entry['locations']
+        except (KeyError, TypeError):
+            # Stored without its location by an earlier version.
+            stale.append(componentId)
+            continue
+
+        fastest = [
+            rankedId for rankedId in ranked if rankedId in available
+        ][:1]
+        if fastest and fastest != [locationId]:
+            stale.append(componentId)
+        elif _pathExists(path):
+            componentFilesystemPaths[componentId] = path
+            componentPathLocations[componentId] = (locationId, available)
+        else:
+            stale.append(componentId)
+
+    if stale:
+        logger.debug(
+            'Invalidating cached paths for components: {0}'.format(stale)
+        )
+        componentPathCache.remove_many(stale)
+
+
+def _setFilePath(component, location, path):
+    '''Record *path* of *component* resolved in *location*.'''
+    try:
+        available = [
+            componentLocation['location_id']
+            for componentLocation in component['component_locations']
+        ]
+    except Exception:
+        available = []
+
+    componentFilesystemPaths[component['id']] = path
+    componentPathLocations[component['id']] = (location['id'], available)
+
+
+def _persistFilePaths(componentIds):
+    '''Store known paths of *componentIds* in the persistent cache.'''
+    if componentPathCache is None:
+        return
+
+    entries = {}
+    for componentId in componentIds:
+        if componentId not in componentFilesystemPaths:
+            continue
+
+        locationId, available = componentPathLocations.get(
+            componentId, (None, [])
+        )
+        entries[componentId] = {
+            'path': componentFilesystemPaths[componentId],
+            'location': locationId,
+            'locations': available
+        }
+
+    componentPathCache.set_many(entries)
 
 
 def _getFilePath(componentId):
     '''Return a single access path based on *source* and *location*'''
     global componentFilesystemPaths
 
+    _loadPersistedFilePaths([componentId])
     path = componentFilesystemPaths.get(componentId, None)
 
     if path is None:
+        session = _getSession()
         ftrack_component = session.get('Component', componentId)
-        location = session.pick_location(component=ftrack_component)
-        path = location.get_filesystem_path(ftrack_component)
-        componentFilesystemPaths[componentId] = path
+        for location in _pickLocations(session, [ftrack_component])[0]:
+            try:
+                path = location.get_filesystem_path(ftrack_component)
+            except Exception:
+                logger.debug(
+                    'Failed to resolve path for component {0} in location '
+                    '{1!r}.'.format(componentId, location['name'])
+                )
+                continue
+
+            if path is not None:
+                break
+
+        if path is None:
+            raise ValueError(
+                'Component {0} is not accessible in any location.'.format(
+                    componentId
+                )
+            )
+
+        _setFilePath(ftrack_component, location, path)
+        _persistFilePaths([componentId])
 
     return path
 
 
-def _ftrackAddVersion(track, layout):
-    stackInputs = rv.commands.nodeConnections(layout, False)[0]
-    newSource = rv.commands.addSourceVerbose([track], None)
-    rv.commands.setNodeInputs(layout, stackInputs)
-    rv.extra_commands.setUIName(
-        rv.commands.nodeGroup(newSource), track
-    )
+def _resolveFilePaths(componentIds):
+    '''Return access paths for all *componentIds*, resolving them in bulk.
 
-    return newSource
+    Components not already present in `componentFilesystemPaths` are fetched
+    in batches of `COMPONENT_BATCH_SIZE` and their locations picked in a
+    single pass, instead of one server round trip per component. The
+    returned list matches the order of *componentIds* and contains None for
+    components that could not be resolved.
 
+    '''
+    global componentFilesystemPaths
 
-def _ftrackCreateGroup(tracks, sourceNode, layout):
-    singleSources = []
-    for track in tracks:
+    _loadPersistedFilePaths(componentIds)
+
+    missing = []
+    for componentId in componentIds:
+        if (
+            componentId and componentId not in componentFilesystemPaths and
+            componentId not in missing
+        ):
+            missing.append(componentId)
+
+    for offset in range(0, len(missing), COMPONENT_BATCH_SIZE):
+        batch = missing[offset:offset + COMPONENT_BATCH_SIZE]
         try:
-            singleSources.append(
-                rv.commands.nodeGroup(_ftrackAddVersion(track, layout))
+            _resolveFilePathsBatch(batch)
+        except Exception:
+            logger.exception(
+                'Failed to resolve paths for components: {0}'.format(batch)
             )
-        except Exception as error:
-            logger.exception(error)
 
-    rv.commands.setNodeInputs(
-        sourceNode, singleSources
-    )
+    _persistFilePaths(missing)
 
+    return [
+        componentFilesystemPaths.get(componentId)
+        for componentId in componentIds
+    ]
 
-def loadPlaylist(playlist, index=None, includeFrame=None):
-    '''Load a playlist into RV.
 
-    Load a specified *playlist* into RV and jump to an optional *index*. If
-    *includeFrame* is an optional frame reference.
+def _resolveFilePathsBatch(componentIds):
+    '''Resolve and cache access paths for a batch of *componentIds*.'''
+    global componentFilesystemPaths
+
+    session = _getSession()
+    components = session.query(
+        'select id, name, file_type, container_size, '
+        'component_locations.location_id, '
+        'component_locations.resource_identifier '
+        'from Component where id in ({0})'.format(
+            ', '.join(
+                '"{0}"'.format(componentId) for componentId in componentIds
+            )
+        )
+    ).all()
+
+    # Group components by their best location so that resource identifiers
+    # can be fetched with one query per location. Components whose path
+    # could not be resolved are grouped again by their next location.
+    pending = list(zip(components, _pickLocations(session, components)))
+    while pending:
+        componentsByLocation = collections.OrderedDict()
+        for component, candidates in pending:
+            if not candidates:
+                logger.warning(
+                    'Component with Id "{0}" is not available in any '
+                    'accessible location.'.format(component['id'])
+                )
+                continue
+
+            componentsByLocation.setdefault(
+                candidates[0]['id'], (candidates[0], [])
+            )[1].append((component, candidates[1:]))
+
+        pending = []
+        for location, items in componentsByLocation.values():
+            locationComponents = [component for component, _ in items]
+            try:
+                resourceIdentifiers = location.get_resource_identifiers(
+                    locationComponents
+                )
+                paths = [
+                    location.accessor.get_filesystem_path(resourceIdentifier)
+                    for resourceIdentifier in resourceIdentifiers
+                ]
+            except Exception:
+                logger.debug(
+                    'Bulk path resolution not supported by location {0!r}, '
+                    'resolving components individually.'.format(
+                        location['name']
+                    )
+                )
+                paths = []
+                for component in locationComponents:
+                    try:
+                        paths.append(location.get_filesystem_path(component))
+                    except Exception:
+                        logger.debug(
+                            'Failed to resolve path for component {0} in '
+                            'location {1!r}.'.format(
+                                component['id'], location['name']
+                            )
+                        )
+                        paths.append(None)
+
+            for (component, remaining), path in zip(items, paths):
+                if path is not None:
+                    _setFilePath(component, location, path)
+                else:
+                    pending.append((component, remaining))
+
+
+def _probeLocations(locations):
+    '''Return read latency of each of *locations*, None if not accessible.
+
+    Only locations with a filesystem backed accessor, such as a DiskAccessor,
+    are accessible. The prefixes of all accessors are read at once, each in
+    a separate thread, so that hung network mounts are given up on together
+    after LOCATION_PROBE_TIMEOUT seconds.
 
     '''
-    _setWipeMode(False)
-    startFrame = 1
+    results = {}
+    probes = []
 
-    if not includeFrame == 'false':
-        startFrame = rv.extra_commands.sourceFrame(rv.commands.frame(), None)
+    def probe(index, prefix):
+        start = time.time()
+        try:
+            if os.path.isdir(prefix):
+                os.listdir(prefix)
+                results[index] = time.time() - start
+        except OSError:
+            pass
+
+    for index, location in enumerate(locations):
+        accessor = getattr(location, 'accessor', None)
+        prefix = getattr(accessor, 'prefix', None)
+        if not prefix:
+            continue
+
+        thread = threading.Thread(target=probe, args=(index, prefix))
+        thread.daemon = True
+        thread.start()
+        probes.append((index, thread, prefix))
+
+    latencies = [None] * len(locations)
+    deadline = time.time() + LOCATION_PROBE_TIMEOUT
+    for index, thread, prefix in probes:
+        thread.join(max(deadline - time.time(), 0))
+        if thread.is_alive():
+            logger.warning(
+                'Timed out probing location {0!r} at {1!r}.'.format(
+                    locations[index]['name'], prefix
+                )
+            )
+            continue
 
-    for oldSource in rv.commands.nodesOfType('RVSourceGroup'):
-        rv.commands.deleteNode(oldSource)
+        latencies[index] = results.get(index)
 
-    sources = []
-    for item in playlist:
-        sources.append(_getFilePath(
-            item.get('componentId')
-        ))
+    return latencies
 
-    sequenceSourceNode = _getSourceNode('sequence')
 
-    _ftrackCreateGroup(sources, sequenceSourceNode, 'defaultLayout')
-    rv.commands.setViewNode(sequenceSourceNode)
+def _getLocationLatencies():
+    '''Return list of accessible locations and their read latency.
 
-    if index:
-        ftrackJumpTo(index, startFrame)
+    Each location is returned as a tuple of its id, name, priority and
+    latency. Locations are probed once per session, by a startup worker of
+    their own so that slow mounts do not hold up other api calls.
 
+    '''
+    global locationLatencies
+
+    with locationLatenciesLock:
+        if locationLatencies is None:
+            locations = _getSession().query('Location').all()
+            latencies = []
+            for location, latency in zip(
+                locations, _probeLocations(locations)
+            ):
+                if latency is not None:
+                    logger.debug(
+                        'Location {0!r} read latency {1:.4f}s.'.format(
+                            location['name'], latency
+                        )
+                    )
+                    latencies.append((
+                        location['id'], location['name'],
+                        getattr(location, 'priority', None) or 0, latency
+                    ))
+
+            locationLatencies = latencies
+
+    return locationLatencies
+
+
+def _getLocationPriorities():
+    '''Return location priorities configured by name in the settings.'''
+    priorities = _readSetting('locationPriorities', '')
+    if not priorities:
+        return {}
 
-def validateComponentLocation(componentId, versionId):
-    '''Return if the *componentId* is accessible in a local location.'''
     try:
-        _getFilePath(componentId)
-    except Exception:
+        return dict(json.loads(priorities))
+    except (TypeError, ValueError):
         logger.warning(
-            'Component with Id "{0}" is not available in any location.'.format(
-                componentId
+            'Ignoring invalid locationPriorities setting {0!r}.'.format(
+                priorities
             )
         )
-        try:
-            rv.commands.sendInternalEvent(
-                'ftrack-event',
-                base64.b64encode(
-                    json.dumps(
-                        {
-                            'type': 'breakItem',
-                            'versionId': versionId
-                        }
-                    ).encode("utf-8")
-                ).decode('ascii'),
-                None
-            )
-        except Exception:
-            logger.error(
-                'Could not send internal event to ftrack.'
-            )
+        return {}
 
 
-def ftrackCompare(data):
-    '''Activate compare mode in RV
+def _getRankedLocations():
+    '''Return probed locations, fastest first.
 
-    Activiate compare mode of *type* between *componentIdA* and *componentIdB*
+    Locations with a read latency within LOCATION_LATENCY_RESOLUTION of each
+    other are ordered by priority. Empty while locations are still being
+    probed, which is never waited for on RV's main thread.
 
     '''
-    _setWipeMode(False)
-    startFrame = 1
-    try:
-        startFrame = rv.extra_commands.sourceFrame(rv.commands.frame(), None)
-    except Exception:
-        pass
+    priorities = _getLocationPriorities()
 
-    componentIdA = data.get('componentIdA')
-    componentIdB = data.get('componentIdB')
-    mode = data.get('mode')
+    def score(item):
+        _, name, priority, latency = item
+        return (
+            int(latency / LOCATION_LATENCY_RESOLUTION),
+            priorities.get(name, priority)
+        )
 
-    trackA = _getFilePath(componentIdA)
+    return sorted(locationLatencies or [], key=score)
 
-    layout = 'defaultStack' if mode == 'wipe' else 'defaultLayout'
 
-    if not mode == 'load':
-        trackB = _getFilePath(componentIdB)
+def _pickLocations(session, components):
+    '''Return accessible locations of each of *components*, fastest first.
+
+    Components are matched against their component_locations. Components not
+    available in any probed location, or all components while locations are
+    still being probed, fall back to the location picked by *session*.
+
+    '''
+    ordered = _getRankedLocations()
 
+    locations = []
+    missing = []
+    for index, component in enumerate(components):
         try:
-            if mode == 'wipe':
-                sourceNode = _getSourceNode('stack')
-                _ftrackCreateGroup([trackA, trackB], sourceNode, layout)
-                rv.commands.setViewNode(sourceNode)
-                rv.runtime.eval('rvui.toggleWipe()', ['rvui'])
-            else:
-                sourceNode = _getSourceNode('layout')
-                _ftrackCreateGroup([trackA, trackB], sourceNode, layout)
-                rv.commands.setViewNode(sourceNode)
+            available = set(
+                componentLocation['location_id']
+                for componentLocation in component['component_locations']
+            )
         except Exception:
-            print(traceback.format_exc())
-    else:
-        sourceNode = _getSourceNode('layout')
-        _ftrackCreateGroup([trackA], sourceNode, layout)
-        rv.commands.setViewNode(sourceNode)
+            available = set()
+
+        # Locations are configured when the session is created.
+        locations.append([
+            session.get('Location', locationId)
+            for locationId, _, _, _ in ordered
+            if locationId in available
+        ])
+        if not locations[-1]:
+            missing.append(index)
+
+    if missing:
+        for index, location in zip(
+            missing,
+            session.pick_locations([components[index] for index in missing])
+        ):
+            if location is not None:
+                locations[index].append(location)
 
-    if startFrame > 1:
-        rv.commands.setFrame(startFrame)
+    return locations
 
 
-def _getEntityFromEnvironment():
-    # Check for environment variable specifying additional information to
-    # use when loading.
-    eventEnvironmentVariable = 'FTRACK_CONNECT_EVENT'
+def _ftrackAddVersion(track, layout):
+    stackInputs = rv.commands.nodeConnections(layout, False)[0]
+    newSource = rv.commands.addSourceVerbose(
+        [_getCachedMediaPath(track)], None
+    )
+    rv.commands.setNodeInputs(layout, stackInputs)
+    rv.extra_commands.setUIName(
+        rv.commands.nodeGroup(newSource), track
+    )
 
-    eventData = os.environ.get(eventEnvironmentVariable)
+    return newSource
 
-    if eventData is not None:
+
+def _ftrackAddSources(tracks, layout):
+    '''Add *tracks* and return their source groups.
+
+    The returned list matches the order of *tracks* and contains None for
+    tracks that failed to load.
+
+    When available, all tracks are added with a single call to
+    addSourcesVerbose and the inputs of *layout* are restored once, rather
+    than rewiring the graph for every track.
+
+    '''
+    addSourcesVerbose = getattr(rv.commands, 'addSourcesVerbose', None)
+    if addSourcesVerbose is not None and len(tracks) > 1:
+        layoutInputs = rv.commands.nodeConnections(layout, False)[0]
         try:
-            decodedEventData = json.loads(base64.b64decode(eventData))
-        except (TypeError, ValueError):
-            logger.error(
-                'Failed to decode {0}: {1}'
-                .format(eventEnvironmentVariable, eventData)
+            newSources = addSourcesVerbose(
+                [[_getCachedMediaPath(track)] for track in tracks], None
+            )
+        except Exception:
+            logger.exception(
+                'Failed to add sources in bulk, adding them individually.'
             )
         else:
-            selection = decodedEventData.get('selection', [])
-            logger.info('selection {}'.format(selection))
-            # At present only a single entity which should represent an
-            # ftrack List is supported.
-            if selection:
-                try:
-                    entity = selection[0]
-                    entityId = entity.get('entityId')
-                    entityType = entity.get('entityType')
-                    return entityId, entityType
+            rv.commands.setNodeInputs(layout, layoutInputs)
+
+            singleSources = []
+            for track, newSource in zip(tracks, newSources):
+                sourceGroup = rv.commands.nodeGroup(newSource)
+                rv.extra_commands.setUIName(sourceGroup, track)
+                singleSources.append(sourceGroup)
+
+            return singleSources
+
+    singleSources = []
+    for track in tracks:
+        try:
+            singleSources.append(
+                rv.commands.nodeGroup(_ftrackAddVersion(track, layout))
+            )
+        except Exception as error:
+            logger.exception(error)
+            singleSources.append(None)
+
+    return singleSources
+
+
+def _ftrackCreateGroup(tracks, sourceNode, layout):
+    singleSources = [
+        sourceGroup for sourceGroup in _ftrackAddSources(tracks, layout)
+        if sourceGroup
+    ]
+
+    rv.commands.setNodeInputs(
+        sourceNode, singleSources
+    )
+
+    return singleSources
+
+
+def _getSourceGroupFrameCount(sourceGroup):
+    '''Return number of frames *sourceGroup* contributes to a sequence.'''
+    for node in rv.commands.nodesInGroup(sourceGroup):
+        if rv.commands.nodeType(node) == 'RVFileSource':
+            data = rv.commands.sourceMediaInfoList(node)[0]
+            count = (data.get('endFrame', 0) - data.get('startFrame', 0)) + 1
+            return 1 if count == 0 else count
+
+    return 1
+
+
+def _reuseSourceGroups(componentIds):
+    '''Return loaded source groups that can be reused for *componentIds*.
+
+    Source groups of the currently loaded playlist are matched to
+    *componentIds* by component id, in order. The returned list matches
+    *componentIds* and contains None for components that need to be added.
+    All other source groups are deleted.
+
+    '''
+    available = collections.defaultdict(collections.deque)
+    for componentId, sourceGroup in playlistSourceGroups:
+        if sourceGroup and rv.commands.nodeExists(sourceGroup):
+            available[componentId].append(sourceGroup)
+
+    sourceGroups = []
+    for componentId in componentIds:
+        if available.get(componentId):
+            sourceGroups.append(available[componentId].popleft())
+        else:
+            sourceGroups.append(None)
+
+    reused = set(sourceGroups)
+    for oldSource in rv.commands.nodesOfType('RVSourceGroup'):
+        if oldSource not in reused:
+            rv.commands.deleteNode(oldSource)
+
+    return sourceGroups
+
+
+def _addPlaylistSources(
+    componentIds, sourceGroups, indices, strict=False, paths=None
+):
+    '''Add sources for *indices* of *componentIds* into *sourceGroups*.
+
+    Paths are resolved in bulk, unless already resolved in *paths* matching
+    *indices*, and all sources added at once. If *strict* is True, raise if
+    the path of a component can not be resolved, otherwise skip it.
+
+    '''
+    tracks = []
+    trackIndices = []
+    if paths is None:
+        paths = _resolveFilePaths([componentIds[index] for index in indices])
+    for index, path in zip(indices, paths):
+        if path is None:
+            if strict:
+                # Resolve individually to surface the original error.
+                path = _getFilePath(componentIds[index])
+            else:
+                logger.warning(
+                    'Skipping component with Id "{0}" as its path could not '
+                    'be resolved.'.format(componentIds[index])
+                )
+                continue
+
+        tracks.append(path)
+        trackIndices.append(index)
+
+    for index, sourceGroup in zip(
+        trackIndices, _ftrackAddSources(tracks, 'defaultLayout')
+    ):
+        sourceGroups[index] = sourceGroup
+
+
+def _setPlaylistSourceGroups(componentIds, sourceGroups):
+    '''Connect *sourceGroups* to the sequence and record them as loaded.
+
+    Also rebuild the frame offset index used to translate between playlist
+    items and sequence frames. Frame counts are only queried for source
+    groups that were not loaded before.
+
+    '''
+    global playlistSourceGroups
+    global playlistFrameOffsets
+    global sourceGroupFrameCounts
+    global playlistMediaPaths
+    global playlistSourceGroupIndices
+
+    playlistSourceGroups = list(zip(componentIds, sourceGroups))
+    playlistSourceGroupIndices = dict(
+        (sourceGroup, index)
+        for index, sourceGroup in enumerate(sourceGroups) if sourceGroup
+    )
+    playlistMediaPaths = set(
+        componentFilesystemPaths.get(componentId)
+        for componentId, sourceGroup in playlistSourceGroups if sourceGroup
+    )
+
+    rv.commands.setNodeInputs(
+        _getSourceNode('sequence'),
+        [sourceGroup for sourceGroup in sourceGroups if sourceGroup]
+    )
+
+    frameCounts = {}
+    offsets = [0]
+    for sourceGroup in sourceGroups:
+        count = 0
+        if sourceGroup:
+            count = sourceGroupFrameCounts.get(sourceGroup)
+            if count is None:
+                count = _getSourceGroupFrameCount(sourceGroup)
+            frameCounts[sourceGroup] = count
+        offsets.append(offsets[-1] + count)
+
+    sourceGroupFrameCounts = frameCounts
+    playlistFrameOffsets = offsets
+
+    # Let the Mu side rebuild its frame to playlist index table.
+    try:
+        rv.commands.sendInternalEvent(
+            'ftrack-playlist-changed',
+            '{0};{1}'.format(
+                _getSourceNode('sequence'),
+                ','.join(str(offset) for offset in offsets)
+            ),
+            None
+        )
+    except Exception:
+        logger.exception('Could not send playlist changed event.')
+
+
+def _getPlaylistItemOffset(index):
+    '''Return number of sequence frames before playlist item *index*.'''
+    index = min(max(index, 0), len(playlistFrameOffsets) - 1)
+    return playlistFrameOffsets[index]
+
+
+def _getPlaylistIndexAtFrame(frame):
+    '''Return index of the playlist item shown at sequence *frame*.'''
+    if len(playlistFrameOffsets) < 2:
+        return None
+
+    index = bisect.bisect_left(playlistFrameOffsets, frame) - 1
+    return min(max(index, 0), len(playlistFrameOffsets) - 2)
+
+
+def _getCachedMediaPath(path):
+    '''Return local copy of media at *path* if available, otherwise *path*.'''
+    localPath = mediaCachePaths.get(path)
+    if localPath and os.path.exists(localPath):
+        return localPath
+
+    return path
+
+
+def _isPrefetchable(path):
+    '''Return whether media at *path* is a single file that can be copied.'''
+    return bool(path) and not any(
+        character in os.path.basename(path) for character in '%#@'
+    )
+
+
+def _getMediaCachePath(directory, path):
+    '''Return path of the copy of *path* in media cache *directory*.'''
+    return os.path.join(
+        directory, hashlib.sha1(path.encode('utf-8')).hexdigest(),
+        os.path.basename(path)
+    )
+
+
+def _getMediaCacheExecutor():
+    '''Return executor copying media to the local media cache.'''
+    global mediaCacheExecutor
+
+    if mediaCacheExecutor is None:
+        mediaCacheExecutor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=PREFETCH_WORKERS
+        )
+
+    return mediaCacheExecutor
+
+
+def _cacheMedia(path, directory, maxSize, inUse):
+    '''Copy media at *path* into cache *directory* and return the copy.
+
+    A copy left by an earlier session is reused if its size and modification
+    time still match. Return None if *path* is not a file.
+
+    Least recently used copies are evicted to keep *directory* below
+    *maxSize* bytes, except for the copies in *inUse*.
+
+    '''
+    if not os.path.isfile(path):
+        return None
+
+    stat = os.stat(path)
+    localPath = _getMediaCachePath(directory, path)
+    localDirectory = os.path.dirname(localPath)
+
+    try:
+        localStat = os.stat(localPath)
+    except OSError:
+        localStat = None
+
+    if (
+        localStat is None or localStat.st_size != stat.st_size or
+        int(localStat.st_mtime) != int(stat.st_mtime)
+    ):
+        if not os.path.isdir(localDirectory):
+            try:
+                os.makedirs(localDirectory)
+            except OSError:
+                if not os.path.isdir(localDirectory):
+                    raise
+
+        # Copy under a unique name so that a partial copy is never used.
+        partialPath = '{0}.{1}.part'.format(localPath, uuid().hex)
+        try:
+            shutil.copyfile(path, partialPath)
+            os.utime(partialPath, (time.time(), stat.st_mtime))
+            os.rename(partialPath, localPath)
+        finally:
+            if os.path.exists(partialPath):
+                os.remove(partialPath)
+
+        logger.debug(u'Copied {0!r} to {1!r}.'.format(path, localPath))
+        _evictMedia(directory, maxSize, inUse | set([localPath]))
+
+    else:
+        # Access time orders copies for eviction.
+        os.utime(localPath, (time.time(), localStat.st_mtime))
+
+    return localPath
+
+
+def _evictMedia(directory, maxSize, inUse):
+    '''Remove least recently used copies until *directory* fits *maxSize*.
+
+    Copies in *inUse* are kept.
+
+    '''
+    entries = []
+    total = 0
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if name.endswith('.part'):
+                continue
+
+            filePath = os.path.join(root, name)
+            try:
+                stat = os.stat(filePath)
+            except OSError:
+                continue
+
+            total += stat.st_size
+            entries.append((stat.st_atime, stat.st_size, filePath))
+
+    if total <= maxSize:
+        return
+
+    for _, size, filePath in sorted(entries):
+        if total <= maxSize:
+            break
+
+        if filePath in inUse:
+            continue
+
+        try:
+            os.remove(filePath)
+            os.rmdir(os.path.dirname(filePath))
+        except OSError:
+            pass
+
+        total -= size
+
+
+def _getMediaCacheSettings():
+    '''Return number of items to prefetch, cache directory and size.
+
+    The directory is None if it could not be resolved.
+
+    '''
+    global mediaCacheSettings
+
+    if mediaCacheSettings is None:
+        count = int(_readSetting('prefetchItems', PREFETCH_ITEMS))
+
+        try:
+            directory = _readSetting('mediaCacheDirectory', '') or (
+                os.path.join(ftrack_cache.get_cache_directory(), 'media')
+            )
+        except Exception:
+            logger.exception('Failed to get media cache directory.')
+            directory = None
+
+        maxSize = float(
+            _readSetting('mediaCacheSize', MEDIA_CACHE_SIZE)
+        ) * 1024 ** 3
+
+        mediaCacheSettings = (count, directory, maxSize)
+
+    return mediaCacheSettings
+
+
+def _prefetchMedia(index):
+    '''Copy media of the playlist items following *index* to the cache.
+
+    Pending copies of items no longer coming up are cancelled.
+
+    '''
+    count, directory, maxSize = _getMediaCacheSettings()
+    if count <= 0 or directory is None or not playlistSourceGroups:
+        return
+
+    paths = []
+    for componentId, _ in playlistSourceGroups[index + 1:index + 1 + count]:
+        path = componentFilesystemPaths.get(componentId)
+        if _isPrefetchable(path):
+            paths.append(path)
+
+    for path, future in list(mediaCacheFutures.items()):
+        # Cancelling runs the done callback, which may remove it already.
+        if path not in paths and future.cancel():
+            mediaCacheFutures.pop(path, None)
+
+    # Copies loaded sources may have been switched to, copies of the
+    # upcoming items and copies in flight must not be evicted.
+    inUse = set(
+        localPath for path, localPath in mediaCachePaths.items()
+        if path in playlistMediaPaths
+    )
+    inUse.update(
+        _getMediaCachePath(directory, path)
+        for path in set(paths) | set(mediaCacheFutures)
+    )
+
+    for path in paths:
+        if path in mediaCacheFutures:
+            continue
+
+        future = _getMediaCacheExecutor().submit(
+            _cacheMedia, path, directory, maxSize, inUse
+        )
+        mediaCacheFutures[path] = future
+        future.add_done_callback(
+            lambda future, path=path: _callLater(
+                lambda: _useCachedMedia(path, future)
+            )
+        )
+
+
+def _useCachedMedia(path, future):
+    '''Switch playlist sources of *path* to the copy made by *future*.
+
+    The source of the item currently shown is left untouched to not
+    interrupt playback.
+
+    '''
+    if mediaCacheFutures.get(path) is future:
+        del mediaCacheFutures[path]
+
+    if future.cancelled():
+        return
+
+    try:
+        localPath = future.result()
+    except Exception:
+        logger.exception(u'Failed to copy {0!r} to media cache.'.format(path))
+        return
+
+    if localPath is None or not os.path.exists(localPath):
+        return
+
+    mediaCachePaths[path] = localPath
+
+    currentIndex = None
+    if rv.commands.viewNode() == _getSourceNode('sequence'):
+        currentIndex = _getPlaylistIndexAtFrame(rv.commands.frame())
+
+    for itemIndex, (componentId, sourceGroup) in enumerate(
+        playlistSourceGroups
+    ):
+        if (
+            itemIndex == currentIndex or not sourceGroup or
+            componentFilesystemPaths.get(componentId) != path or
+            not rv.commands.nodeExists(sourceGroup)
+        ):
+            continue
+
+        for node in rv.commands.nodesInGroup(sourceGroup):
+            if (
+                rv.commands.nodeType(node) == 'RVFileSource' and
+                path in rv.commands.sourceMedia(node)[0]
+            ):
+                try:
+                    rv.commands.relocateSource(path, localPath, node)
+                except Exception:
+                    logger.exception(
+                        u'Failed to switch {0!r} to local copy.'.format(path)
+                    )
+
+
+def ftrackPrefetch(index):
+    '''Prefetch media of the playlist items following item *index*.'''
+    try:
+        _prefetchMedia(int(index))
+    except Exception:
+        logger.exception('Failed to prefetch media.')
+
+
+def _useProxies(count, quality=None):
+    '''Return whether a playlist of *count* items is loaded as proxies.'''
+    quality = quality or _readSetting('playbackQuality', PLAYBACK_QUALITY)
+    if quality == 'auto':
+        return count >= int(
+            _readSetting('proxyPlaylistSize', PROXY_PLAYLIST_SIZE)
+        )
+
+    return quality == 'proxy'
+
+
+def _getProxyComponentNames():
+    '''Return names of proxy components, most preferred first.'''
+    names = _readSetting('proxyComponentNames', '')
+    if names:
+        return tuple(name.strip() for name in names.split(',') if name.strip())
+
+    return PROXY_COMPONENT_NAMES
+
+
+def _selectRenditions(componentIds, quality=None):
+    '''Return component ids to load for *componentIds* at *quality*.
+
+    When loading proxies, each component is replaced by the most preferred
+    proxy component of its version that has an accessible path. Components
+    without a proxy are loaded as is.
+
+    '''
+    if not _useProxies(len(componentIds), quality):
+        return list(componentIds)
+
+    names = _getProxyComponentNames()
+    missing = []
+    for componentId in componentIds:
+        if (
+            componentId and (names, componentId) not in proxyComponents and
+            componentId not in missing
+        ):
+            missing.append(componentId)
+
+    for offset in range(0, len(missing), COMPONENT_BATCH_SIZE):
+        batch = missing[offset:offset + COMPONENT_BATCH_SIZE]
+        try:
+            _resolveProxyComponentsBatch(batch, names)
+        except Exception:
+            logger.exception(
+                'Failed to resolve proxies for components: {0}'.format(batch)
+            )
+
+    renditions = [
+        proxyComponents.get((names, componentId)) or componentId
+        for componentId in componentIds
+    ]
+
+    # Fall back to the requested component if a proxy can not be accessed.
+    proxies = [
+        rendition for rendition, componentId in zip(renditions, componentIds)
+        if rendition != componentId
+    ]
+    accessible = set(
+        proxyId for proxyId, path in zip(proxies, _resolveFilePaths(proxies))
+        if path is not None
+    )
+
+    # Remember inaccessible proxies, such as reviewable components only in
+    # the ftrack server location, to not resolve them on every load.
+    for rendition, componentId in zip(renditions, componentIds):
+        if rendition != componentId and rendition not in accessible:
+            proxyComponents[(names, componentId)] = None
+
+    return [
+        rendition if rendition in accessible else componentId
+        for rendition, componentId in zip(renditions, componentIds)
+    ]
+
+
+def _resolveProxyComponentsBatch(componentIds, names):
+    '''Resolve proxy components named *names* for a batch of *componentIds*.
+
+    All components of the versions of *componentIds* are fetched with a
+    single query.
+
+    '''
+    components = _getSession().query(
+        'select id, name, version_id from Component '
+        'where version.components any (id in ({0}))'.format(
+            ', '.join(
+                '"{0}"'.format(componentId) for componentId in componentIds
+            )
+        )
+    ).all()
+
+    versions = {}
+    componentVersions = {}
+    for component in components:
+        versions.setdefault(component['version_id'], {})[
+            component['name']
+        ] = component['id']
+        componentVersions[component['id']] = component['version_id']
+
+    for componentId in componentIds:
+        proxyId = None
+        versionComponents = versions.get(componentVersions.get(componentId))
+        for name in names:
+            if versionComponents and name in versionComponents:
+                proxyId = versionComponents[name]
+                break
+
+        proxyComponents[(names, componentId)] = proxyId
+
+
+def ftrackLoadFullResolution(index=None):
+    '''Load playlist item *index*, or the current item, at full resolution.
+
+    The media of the item's source is replaced in place if it was loaded as
+    a proxy, keeping the playhead on the item it is on.
+
+    '''
+    try:
+        currentFrame = rv.commands.frame()
+        currentIndex = None
+        if rv.commands.viewNode() == _getSourceNode('sequence'):
+            currentIndex = _getPlaylistIndexAtFrame(currentFrame)
+
+        if index in (None, '', 'None'):
+            index = currentIndex
+            if index is None:
+                return
+
+        index = int(index)
+        componentId = playlistComponentIds[index]
+        loadedId, sourceGroup = playlistSourceGroups[index]
+        if loadedId == componentId or not sourceGroup:
+            return
+
+        path = _getFilePath(componentId)
+        for node in rv.commands.nodesInGroup(sourceGroup):
+            if rv.commands.nodeType(node) == 'RVFileSource':
+                rv.commands.setSourceMedia(
+                    node, [_getCachedMediaPath(path)], None
+                )
+        rv.extra_commands.setUIName(sourceGroup, path)
+
+        if currentIndex is not None:
+            localFrame = currentFrame - _getPlaylistItemOffset(currentIndex)
+
+        componentIds = [item[0] for item in playlistSourceGroups]
+        sourceGroups = [item[1] for item in playlistSourceGroups]
+        componentIds[index] = componentId
+        sourceGroupFrameCounts.pop(sourceGroup, None)
+        _setPlaylistSourceGroups(componentIds, sourceGroups)
+
+        if currentIndex is not None:
+            rv.commands.setFrame(
+                _getPlaylistItemOffset(currentIndex) + localFrame
+            )
+    except Exception:
+        logger.exception('Failed to load item at full resolution.')
+
+
+@profiler.timed()
+def loadPlaylist(
+    playlist, index=None, includeFrame=None, progressive=None,
+    incremental=None, quality=None
+):
+    '''Load a playlist into RV.
+
+    Load a specified *playlist* into RV and jump to an optional *index*. If
+    *includeFrame* is an optional frame reference.
+
+    If *progressive* is True, or not specified and the ``progressiveLoad``
+    setting is enabled, only the item at *index* is loaded before returning
+    and the rest of the playlist is streamed into the sequence while RV is
+    idle. A ``playlistLoaded`` event is sent to the panels once all items
+    are in.
+
+    If *incremental* is True, or not specified and the ``incrementalLoad``
+    setting is enabled, sources already loaded for a component are kept and
+    only added, removed and reordered items are changed, preserving RV's
+    frame cache for unchanged media.
+
+    *quality* sets whether items are loaded at ``full`` resolution, as
+    ``proxy`` where available, or, with ``auto``, as proxies for long
+    playlists. If not specified the ``playbackQuality`` setting is used.
+
+    '''
+    global playlistLoadId
+    global playlistComponentIds
+
+    _setWipeMode(False)
+    startFrame = 1
+
+    if not includeFrame == 'false':
+        startFrame = rv.extra_commands.sourceFrame(rv.commands.frame(), None)
+
+    playlistLoadId += 1
+
+    playlistComponentIds = [item.get('componentId') for item in playlist]
+    componentIds = _selectRenditions(playlistComponentIds, quality)
+
+    if incremental is None:
+        incremental = _readSetting('incrementalLoad', True)
+
+    if incremental:
+        sourceGroups = _reuseSourceGroups(componentIds)
+    else:
+        for oldSource in rv.commands.nodesOfType('RVSourceGroup'):
+            rv.commands.deleteNode(oldSource)
+        sourceGroups = [None] * len(componentIds)
+
+    missing = [
+        itemIndex for itemIndex, sourceGroup in enumerate(sourceGroups)
+        if sourceGroup is None
+    ]
+    logger.debug(
+        'Loading playlist of {0} items, {1} to add.'.format(
+            len(componentIds), len(missing)
+        )
+    )
+
+    if progressive is None:
+        progressive = _readSetting('progressiveLoad', True)
+
+    if progressive and len(missing) > PROGRESSIVE_LOAD_BATCH_SIZE:
+        _loadPlaylistProgressively(
+            componentIds, sourceGroups, missing, index, startFrame
+        )
+        return
+
+    _addPlaylistSources(componentIds, sourceGroups, missing, strict=True)
+    _setPlaylistSourceGroups(componentIds, sourceGroups)
+    rv.commands.setViewNode(_getSourceNode('sequence'))
+
+    if index:
+        ftrackJumpTo(index, startFrame)
+    else:
+        _prefetchMedia(0)
+
+    _sendFtrackEvent({'type': 'playlistLoaded', 'count': len(componentIds)})
+
+
+def _loadPlaylistProgressively(
+    componentIds, sourceGroups, pending, index, startFrame
+):
+    '''Show item at *index* of *componentIds* and stream in the rest.
+
+    *sourceGroups* holds groups already loaded for each item and *pending*
+    the indices of the items still to add. Paths of all pending items are
+    resolved up front in bulk, only adding the sources is streamed.
+
+    '''
+    try:
+        index = min(max(int(index or 0), 0), len(componentIds) - 1)
+    except (TypeError, ValueError):
+        index = 0
+
+    paths = dict(zip(
+        pending,
+        _resolveFilePaths([componentIds[itemIndex] for itemIndex in pending])
+    ))
+
+    if index in pending:
+        _addPlaylistSources(
+            componentIds, sourceGroups, [index], strict=True,
+            paths=[paths[index]]
+        )
+        pending.remove(index)
+
+    _setPlaylistSourceGroups(componentIds, sourceGroups)
+    rv.commands.setViewNode(_getSourceNode('sequence'))
+    rv.commands.setFrame(_getPlaylistItemOffset(index) + startFrame)
+    _prefetchMedia(index)
+
+    # Stream items following the visible one first as those are most likely
+    # to be watched next.
+    pending.sort(key=lambda itemIndex: (itemIndex < index, itemIndex))
+    _callLater(lambda: _loadPlaylistBatch(
+        playlistLoadId, componentIds, sourceGroups, pending, paths,
+        PROGRESSIVE_LOAD_BATCH_SIZE
+    ))
+
+
+def _loadPlaylistBatch(
+    loadId, componentIds, sourceGroups, pending, paths, size
+):
+    '''Add the next *size* of *pending* playlist items to the sequence.
+
+    *sourceGroups* holds the groups already loaded for each index of
+    *componentIds* and *paths* the resolved path of each pending index.
+    Does nothing if another playlist has been loaded since *loadId*.
+
+    '''
+    if loadId != playlistLoadId:
+        logger.debug('Abandoning progressive load of a previous playlist.')
+        return
+
+    batch = pending[:size]
+    del pending[:size]
+
+    # Remember where the playhead is so that it stays on the same item when
+    # earlier items are inserted in front of it.
+    currentFrame = rv.commands.frame()
+    currentIndex = None
+    if rv.commands.viewNode() == _getSourceNode('sequence'):
+        currentIndex = _getPlaylistIndexAtFrame(currentFrame)
+    if currentIndex is not None:
+        localFrame = currentFrame - _getPlaylistItemOffset(currentIndex) - 1
+
+    _addPlaylistSources(
+        componentIds, sourceGroups, batch,
+        paths=[paths[itemIndex] for itemIndex in batch]
+    )
+    _setPlaylistSourceGroups(componentIds, sourceGroups)
+
+    if currentIndex is not None:
+        rv.commands.setFrame(
+            _getPlaylistItemOffset(currentIndex) + 1 + localFrame
+        )
+
+    if pending:
+        _callLater(lambda: _loadPlaylistBatch(
+            loadId, componentIds, sourceGroups, pending, paths, size * 2
+        ))
+    else:
+        _sendFtrackEvent({
+            'type': 'playlistLoaded',
+            'count': len([
+                sourceGroup for sourceGroup in sourceGroups if sourceGroup
+            ])
+        })
+
+
+def validateComponentLocation(componentId, versionId):
+    '''Return if the *componentId* is accessible in a local location.'''
+    try:
+        _getFilePath(componentId)
+    except Exception:
+        logger.warning(
+            'Component with Id "{0}" is not available in any location.'.format(
+                componentId
+            )
+        )
+        _sendFtrackEvent({
+            'type': 'breakItem',
+            'versionId': versionId
+        })
+
+
+def _getCompareSourceGroups(componentIds, layout):
+    '''Return source groups showing *componentIds* for comparing.
+
+    Source groups of the loaded playlist and of earlier compares are
+    reused, only components not loaded yet are added.
+
+    '''
+    available = dict(
+        (componentId, sourceGroup)
+        for componentId, sourceGroup in playlistSourceGroups if sourceGroup
+    )
+    for componentId, sourceGroup in list(compareSourceGroups.items()):
+        if rv.commands.nodeExists(sourceGroup):
+            available.setdefault(componentId, sourceGroup)
+        else:
+            del compareSourceGroups[componentId]
+
+    missing = [
+        componentId for componentId in componentIds
+        if componentId not in available or
+        not rv.commands.nodeExists(available[componentId])
+    ]
+    if missing:
+        tracks = _resolveFilePaths(missing)
+        for index, track in enumerate(tracks):
+            if track is None:
+                # Resolve individually to surface the original error.
+                tracks[index] = _getFilePath(missing[index])
+
+        for componentId, sourceGroup in zip(
+            missing, _ftrackAddSources(tracks, layout)
+        ):
+            if sourceGroup:
+                available[componentId] = sourceGroup
+                compareSourceGroups[componentId] = sourceGroup
+
+    sourceGroups = []
+    for componentId in componentIds:
+        if componentId in available:
+            sourceGroups.append(available[componentId])
+            if componentId in compareSourceGroups:
+                compareSourceGroups.move_to_end(componentId)
+
+    _evictCompareSourceGroups(componentIds)
+
+    return sourceGroups
+
+
+def _evictCompareSourceGroups(keep):
+    '''Delete least recently used compare source groups beyond the limit.
+
+    Groups of components in *keep* and of the loaded playlist are kept.
+
+    '''
+    playlistGroups = set(
+        sourceGroup for _, sourceGroup in playlistSourceGroups
+    )
+    for componentId in list(compareSourceGroups):
+        if len(compareSourceGroups) <= COMPARE_CACHE_SIZE:
+            break
+
+        if componentId in keep:
+            continue
+
+        sourceGroup = compareSourceGroups.pop(componentId)
+        if sourceGroup not in playlistGroups:
+            rv.commands.deleteNode(sourceGroup)
+
+
+@profiler.timed()
+def ftrackCompare(data):
+    '''Activate compare mode in RV
+
+    Activiate compare mode of *type* between *componentIdA* and *componentIdB*
+
+    Source groups are kept alive between compares so that switching between
+    modes for the same components only re-points the stack or layout.
+
+    With mode *grid*, all components in *componentIds* are shown as a
+    contact sheet, see :func:`_ftrackCompareGrid`.
+
+    '''
+    if data.get('mode') == 'grid':
+        return _ftrackCompareGrid(data)
+
+    startFrame = 1
+    try:
+        startFrame = rv.extra_commands.sourceFrame(rv.commands.frame(), None)
+    except Exception:
+        pass
+
+    componentIdA = data.get('componentIdA')
+    componentIdB = data.get('componentIdB')
+    mode = data.get('mode')
+
+    layout = 'defaultStack' if mode == 'wipe' else 'defaultLayout'
+
+    if not mode == 'load':
+        componentIds = [componentIdA, componentIdB]
+    else:
+        componentIds = [componentIdA]
+
+    sourceGroups = _getCompareSourceGroups(componentIds, layout)
+
+    try:
+        sourceNode = _getSourceNode('stack' if mode == 'wipe' else 'layout')
+        if rv.commands.nodeConnections(sourceNode, False)[0] != sourceGroups:
+            rv.commands.setNodeInputs(sourceNode, sourceGroups)
+
+        rv.commands.setViewNode(sourceNode)
+    except Exception:
+        print(traceback.format_exc())
+
+    _setWipeMode(mode == 'wipe')
+
+    if startFrame > 1:
+        rv.commands.setFrame(startFrame)
+
+
+def _ftrackCompareGrid(data):
+    '''Show all components in *data* side by side in a grid.
+
+    *data* holds a list of *componentIds* and an optional *quality* of
+    ``full`` or ``proxy``. When no quality is given, proxies are loaded for
+    grids of more than ``gridProxyTiles`` tiles to keep playback real time.
+
+    '''
+    startFrame = 1
+    try:
+        startFrame = rv.extra_commands.sourceFrame(rv.commands.frame(), None)
+    except Exception:
+        pass
+
+    componentIds = [
+        componentId for componentId in data.get('componentIds') or []
+        if componentId
+    ]
+    if not componentIds:
+        return
+
+    quality = data.get('quality')
+    if not quality:
+        proxyTiles = int(_readSetting('gridProxyTiles', GRID_PROXY_TILES))
+        quality = 'proxy' if len(componentIds) > proxyTiles else 'full'
+
+    sourceGroups = _getCompareSourceGroups(
+        _selectRenditions(componentIds, quality), 'defaultLayout'
+    )
+
+    gridNode = _getSourceNode('grid')
+    columns = int(math.ceil(math.sqrt(len(sourceGroups))))
+    rows = int(math.ceil(len(sourceGroups) / float(max(columns, 1))))
+
+    try:
+        rv.commands.setIntProperty(
+            '{0}.layout.gridColumns'.format(gridNode), [columns], True
+        )
+        rv.commands.setIntProperty(
+            '{0}.layout.gridRows'.format(gridNode), [rows], True
+        )
+    except Exception:
+        logger.debug('Grid dimensions not supported, using RV defaults.')
+
+    if rv.commands.nodeConnections(gridNode, False)[0] != sourceGroups:
+        rv.commands.setNodeInputs(gridNode, sourceGroups)
+
+    _setWipeMode(False)
+    rv.commands.setViewNode(gridNode)
+
+    if startFrame > 1:
+        rv.commands.setFrame(startFrame)
+
+
+def _respondAsync(requestId, status, result=None):
+    '''Post *result* of asynchronous call *requestId* back to Mu.
+
+    Only the first response for *requestId* is sent, so results arriving
+    after a timeout are discarded. Can be called from any thread.
+
+    '''
+    with apiRequestsLock:
+        if requestId not in apiRequestsPending:
+            return
+        apiRequestsPending.discard(requestId)
+
+    contents = '{0};{1};{2}'.format(
+        requestId, status,
+        base64.b64encode(
+            (u'' if result is None else u'{0}'.format(result)).encode('utf-8')
+        ).decode('ascii')
+    )
+
+    def send():
+        try:
+            rv.commands.sendInternalEvent(
+                'ftrack-api-response', contents, None
+            )
+        except Exception:
+            logger.exception('Could not send api response.')
+
+    _callLater(send)
+
+
+def _getApiExecutor():
+    '''Return executor running api calls in the background.'''
+    global apiExecutor
+
+    if apiExecutor is None:
+        apiExecutor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    return apiExecutor
+
+
+def _runAsync(requestId, function, params, timer):
+    '''Call *function* with *params* and respond to *requestId*.
+
+    *timer* reporting the call as timed out is cancelled once it returns.
+
+    '''
+    try:
+        result = function(params)
+    except Exception as error:
+        timer.cancel()
+        logger.exception('Asynchronous call {0} failed.'.format(requestId))
+        _respondAsync(requestId, 'error', error)
+    else:
+        timer.cancel()
+        _respondAsync(requestId, 'ok', result)
+
+
+def callAsync(request):
+    '''Run the api function described by *request* in the background.
+
+    *request* is formatted as ``<request id>;<function name>;<params>`` and
+    calls the public function of this module with *params*. The result is
+    posted back with an ``ftrack-api-response`` event formatted as
+    ``<request id>;<ok|error|timeout>;<base64 encoded result>``.
+
+    If the call does not finish within API_CALL_TIMEOUT seconds a timeout
+    response is sent and its eventual result discarded.
+
+    '''
+    requestId, action, params = request.split(';', 2)
+
+    with apiRequestsLock:
+        apiRequestsPending.add(requestId)
+
+    function = globals().get(action)
+    if action.startswith('_') or not callable(function):
+        logger.error('Unknown api function {0!r}.'.format(action))
+        _respondAsync(requestId, 'error', 'Unknown api function.')
+        return
+
+    timer = threading.Timer(
+        API_CALL_TIMEOUT, _respondAsync, (requestId, 'timeout')
+    )
+    timer.daemon = True
+    timer.start()
+
+    _getApiExecutor().submit(_runAsync, requestId, function, params, timer)
+
+
+def _getEntityFromEnvironment():
+    # Check for environment variable specifying additional information to
+    # use when loading.
+    eventEnvironmentVariable = 'FTRACK_CONNECT_EVENT'
+
+    eventData = os.environ.get(eventEnvironmentVariable)
+
+    if eventData is not None:
+        try:
+            decodedEventData = json.loads(base64.b64decode(eventData))
+        except (TypeError, ValueError):
+            logger.error(
+                'Failed to decode {0}: {1}'
+                .format(eventEnvironmentVariable, eventData)
+            )
+        else:
+            selection = decodedEventData.get('selection', [])
+            logger.info('selection {}'.format(selection))
+            # At present only a single entity which should represent an
+            # ftrack List is supported.
+            if selection:
+                try:
+                    entity = selection[0]
+                    entityId = entity.get('entityId')
+                    entityType = entity.get('entityType')
+                    return entityId, entityType
                 except (IndexError, AttributeError, KeyError):
                     logger.error(
                         'Failed to extract selection information from: {0}'
@@ -338,174 +2140,1140 @@ def _getEntityFromEnvironment():
             .format(eventEnvironmentVariable)
         )
 
-    return None, None
+    return None, None
+
+
+def getNavigationURL(params=None):
+    '''Return URL to navigation panel based on *params*.'''
+    return _getPanelURL(params, 'review_navigation')
+
+
+def getActionURL(params=None):
+    '''Return URL to action panel based on *params*.'''
+    return _getPanelURL(params, 'review_action')
+
+
+def _getPanelURL(params, panelName):
+    '''Return URL to *panelName*, reusing the URL resolved at startup.'''
+    future = startupUrls.pop((panelName, params), None)
+    if future is not None:
+        try:
+            return future.result()
+        except Exception:
+            logger.exception(
+                'Failed to resolve {0} URL at startup.'.format(panelName)
+            )
+
+    return _generateURL(params, panelName)
+
+
+def ftrackPanelLoaded(panelName):
+    '''Log time from plugin load until *panelName* first finished loading.'''
+    if panelName not in loadedPanels:
+        loadedPanels.add(panelName)
+        duration = time.time() - startupTime
+        profiler.record(
+            'startup panel {0}'.format(panelName), startupTime, duration,
+            category='startup'
+        )
+        logger.info(
+            'Panel {0} loaded {1:.3f}s after plugin load.'.format(
+                panelName, duration
+            )
+        )
+
+
+def _translateEntityType(entityType):
+    '''Return translated entity type tht can be used with API.'''
+    # Get entity type and make sure it is lower cased. Most places except
+    # the component tab in the Sidebar will use lower case notation.
+    entity_type = entityType.replace('_', '').lower()
+
+    try:
+        return _getEntityTypeIndex()[entity_type]
+    except KeyError:
+        raise ValueError(
+            'Unable to translate entity type: {0}.'.format(entity_type)
+        )
+
+
+def _getEntityTypeIndex():
+    '''Return mapping of lower cased entity type names to schema ids.'''
+    global entityTypeIndex
+
+    if entityTypeIndex is None:
+        aliases = {}
+        ids = {}
+        for schema in _getSession().schemas:
+            alias_for = schema.get('alias_for')
+            if alias_for and isinstance(alias_for, str):
+                aliases.setdefault(alias_for.lower(), schema['id'])
+
+            ids.setdefault(schema['id'].lower(), schema['id'])
+
+        # Aliases take precedence over schema ids.
+        ids.update(aliases)
+        entityTypeIndex = ids
+
+    return entityTypeIndex
+
+def _get_temp_data_url(name, temp_data_id, theme=None):
+    operation = {
+        'action': 'get_widget_url',
+        'name': name,
+        'theme': theme,
+    }
+
+    result = _getSession().call([operation])
+    url = result[0]['widget_url']
+    full_url = '{}&entityType=tempdata&entityId={}'.format(url, temp_data_id)
+    return full_url
+
+
+def _resolveWidgetUrl(panelName, entityType, entityId, theme=None):
+    '''Return URL of widget *panelName* for an entity from the server.'''
+    if entityType == 'tempdata':
+        return _get_temp_data_url(panelName, entityId, theme)
+
+    new_entity_type = _translateEntityType(entityType)
+    session = _getSession()
+    new_entity = session.get(new_entity_type, entityId)
+    return session.get_widget_url(panelName, entity=new_entity, theme=theme)
+
+
+def _refreshWidgetUrl(key):
+    '''Resolve widget URL for cache *key* again and store it.'''
+    try:
+        url = _resolveWidgetUrl(*key)
+        if url:
+            with widgetUrlsLock:
+                widgetUrls[key] = (url, time.time())
+    except Exception:
+        logger.exception('Failed to refresh widget URL {0}.'.format(key))
+    finally:
+        with widgetUrlsLock:
+            widgetUrlsRefreshing.discard(key)
+
+
+def _getWidgetUrl(panelName, entityType, entityId, theme=None):
+    '''Return URL of widget *panelName* for an entity.
+
+    URLs are cached for WIDGET_URL_TTL seconds. Cached URLs older than
+    WIDGET_URL_REFRESH seconds are returned as is while a fresh one is
+    resolved in the background.
+
+    '''
+    key = (panelName, entityType, entityId, theme)
+    now = time.time()
+
+    with widgetUrlsLock:
+        url, resolved = widgetUrls.get(key, (None, 0))
+        age = now - resolved
+
+        if url and age < WIDGET_URL_TTL:
+            if age > WIDGET_URL_REFRESH and key not in widgetUrlsRefreshing:
+                widgetUrlsRefreshing.add(key)
+                _getApiExecutor().submit(_refreshWidgetUrl, key)
+            return url
+
+    url = _resolveWidgetUrl(panelName, entityType, entityId, theme)
+    if url:
+        with widgetUrlsLock:
+            widgetUrls[key] = (url, now)
+
+    return url
+
+
+@profiler.timed()
+def _generateURL(params=None, panelName=None):
+    '''Return URL to panel in ftrack based on *params* or *panel*.'''
+    logger.info('_generateURL with params: {}'.format(params))
+    url = ''
+    try:
+        entityId = None
+        entityType = None
+
+        if params:
+            panelName = panelName or params
+            try:
+                params = json.loads(params)
+                entityId = params['entityId'][0]
+                entityType = params['entityType'][0]
+            except Exception:
+                entityId, entityType = _getEntityFromEnvironment()
+
+            if (entityId and entityType):
+                try:
+                    url = _getWidgetUrl(panelName, entityType, entityId)
+                except Exception as exception:
+                    logger.error(str(exception))
+
+        logger.info('Returning url "{0}"'.format(url))
+    except Exception as error:
+        logger.exception('Failed to generate URL. {}'.format(error))
+    return url
+
+
+def _getExportDirectory():
+    '''Return directory annotated frames are exported to.
+
+    Will create the directory if it does not exist.
+
+    '''
+    directory = os.path.join(tempfile.gettempdir(), EXPORT_DIRECTORY)
+    try:
+        os.makedirs(directory)
+    except OSError:
+        if not os.path.isdir(directory):
+            raise
+
+    return directory
+
+
+def ftrackFilePath(id):
+    try:
+        if id != "":
+            filename = "%s.%s" % (id, _getExportSettings()[0])
+            filepath = os.path.join(_getExportDirectory(), filename)
+        else:
+            filepath = _getExportDirectory()
+        return filepath
+    except Exception:
+        logger.exception('Failed to get file path.')
+        return ''
+
+
+def ftrackUUID(short):
+    '''Retun a uuid based on uuid1
+    '''
+    return str(uuid())
+
+
+def ftrackViewPlaylistItem(index):
+    '''View the source group of playlist item *index* on its own.
+
+    Return the name of the source group, or an empty string if there is no
+    source loaded for *index*.
+
+    '''
+    try:
+        index = int(index)
+        if playlistSourceGroups:
+            sourceGroup = playlistSourceGroups[index][1]
+        else:
+            # Sources not loaded as a playlist, in the order they were added.
+            sourceGroup = sorted(rv.commands.nodesOfType('RVSourceGroup'))[
+                index
+            ]
+    except (IndexError, TypeError, ValueError):
+        sourceGroup = None
+
+    if not sourceGroup or not rv.commands.nodeExists(sourceGroup):
+        logger.warning(
+            'No source loaded for playlist item {0!r}.'.format(index)
+        )
+        return ''
+
+    rv.commands.setViewNode(sourceGroup)
+    return sourceGroup
+
+
+def ftrackPlaylistIndex(source):
+    '''Return playlist index of the item loaded by *source*.
+
+    *source* is a source node or source group. Return the index as string,
+    or an empty string if *source* is not part of the playlist.
+
+    '''
+    try:
+        sourceGroup = source
+        if rv.commands.nodeType(source) != 'RVSourceGroup':
+            sourceGroup = rv.commands.nodeGroup(source)
+
+        if playlistSourceGroups:
+            index = playlistSourceGroupIndices[sourceGroup]
+        else:
+            # Sources not loaded as a playlist, in the order they were added.
+            index = sorted(rv.commands.nodesOfType('RVSourceGroup')).index(
+                sourceGroup
+            )
+    except Exception:
+        return ''
+
+    return str(index)
+
+
+@profiler.timed()
+def ftrackJumpTo(index=0, startFrame=1):
+    '''Move playhead to an index
+
+    Moves the RV playhead to the specified *index*
+
+    '''
+    try:
+        index = int(index)
+        frameNumber = 0
+
+        if playlistSourceGroups:
+            frameNumber = _getPlaylistItemOffset(index)
+        else:
+            for idx, source in enumerate(
+                rv.commands.nodesOfType('RVFileSource')
+            ):
+                if not idx >= index:
+                    data = rv.commands.sourceMediaInfoList(source)[0]
+                    add = (
+                        data.get('endFrame', 0) - data.get('startFrame', 0)
+                    ) + 1
+                    add = 1 if add == 0 else add
+                    frameNumber += (add)
+
+        rv.commands.setFrame(frameNumber + startFrame)
+
+        # Prefetch once RV is idle to not delay the jump.
+        if playlistSourceGroups:
+            _callLater(lambda: ftrackPrefetch(index))
+    except Exception:
+        logger.exception('Failed to jump to index.')
+
+
+def ftrackProfile(reset=None):
+    '''Return JSON encoded durations and counts recorded by the profiler.
+
+    Statistics are cleared after being returned if *reset* is set.
+
+    '''
+    summary = profiler.summary()
+    if reset and reset not in ('0', 'false', 'False', 'None'):
+        profiler.reset()
+
+    return json.dumps(summary)
+
+
+def ftrackProfileDump(path=None):
+    '''Write profile of this session to *path* and return the path.
+
+    The profile is written as a Chrome trace, by default to the log
+    directory.
+
+    '''
+    if not path:
+        try:
+            directory = ftrack_logging.get_log_directory()
+        except Exception:
+            directory = tempfile.gettempdir()
+
+        path = os.path.join(
+            directory, 'ftrack_connect_rv_profile_{0}.json'.format(os.getpid())
+        )
+
+    try:
+        profiler.dump(path)
+    except Exception:
+        logger.exception(u'Failed to write profile to {0!r}.'.format(path))
+        return ''
+
+    logger.info(u'Profile written to {0!r}.'.format(path))
+    return path
+
+
+@profiler.timed()
+def create_component(encoded_args):
+    '''Create component without adding it to a location.
+
+    *encoded_args* should be a JSON encoded dictionary containing file_name and
+    frame.
+
+    Store reference in annotation_components.
+    '''
+    component_id = None
+    try:
+        args = json.loads(encoded_args)
+        component_id = _createComponents([args])[0]
+    except Exception:
+        logger.exception('Failed to create component.')
+
+    return component_id
+
+
+@profiler.timed()
+def create_components(encoded_args):
+    '''Create components for several files in a single commit.
+
+    *encoded_args* should be a JSON encoded list of dictionaries containing
+    file_name and frame.
+
+    Return JSON encoded dictionary mapping each file_name to the id of its
+    component, which can be passed on to upload_components. Store references
+    in annotation_components.
+    '''
+    mapping = {}
+    try:
+        files = json.loads(encoded_args)
+        mapping = dict(zip(
+            [item['file_name'] for item in files], _createComponents(files)
+        ))
+    except Exception:
+        logger.exception('Failed to create components.')
+
+    return json.dumps(mapping)
+
+
+def _hashFile(file_path):
+    '''Return SHA-256 hex digest of the content of *file_path*.'''
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file_object:
+        for block in iter(lambda: file_object.read(1024 * 1024), b''):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def _getUploadIndexKey(content_hash):
+    '''Return upload index key of *content_hash* on the current server.'''
+    return u'{0}:{1}'.format(os.environ.get('FTRACK_SERVER'), content_hash)
+
+
+def _findUploadedComponents(session, hashes):
+    '''Return mapping of *hashes* to components uploaded with that content.
+
+    Components are only returned if they are still in the server location,
+    entries of other components are removed from the upload index.
+
+    '''
+    if uploadIndex is None or not hashes:
+        return {}
+
+    keys = dict((_getUploadIndexKey(value), value) for value in hashes)
+    indexed = dict(
+        (keys[key], component_id)
+        for key, component_id in uploadIndex.get_many(keys).items()
+    )
+    if not indexed:
+        return {}
+
+    available = set(
+        component['id'] for component in session.query(
+            'select id from Component where id in ({0}) and '
+            'component_locations any (location_id is "{1}")'.format(
+                ', '.join(
+                    '"{0}"'.format(component_id)
+                    for component_id in set(indexed.values())
+                ),
+                ftrack_api.symbol.SERVER_LOCATION_ID
+            )
+        )
+    )
+
+    uploadIndex.remove_many([
+        _getUploadIndexKey(content_hash)
+        for content_hash, component_id in indexed.items()
+        if component_id not in available
+    ])
+
+    return dict(
+        (content_hash, component_id)
+        for content_hash, component_id in indexed.items()
+        if component_id in available
+    )
+
+
+def _createComponents(files):
+    '''Create and commit components for *files* and return their ids.
+
+    *files* is a list of dictionaries containing file_name and frame. The
+    components are persisted with a single commit so upload workers can
+    retrieve them with their own session.
+
+    Files with the same content as a component uploaded earlier reuse that
+    component instead of creating a new one.
+
+    '''
+    session = _getSession()
+
+    paths = [
+        os.path.join(ftrackFilePath(''), item['file_name']) for item in files
+    ]
+    hashes = [_hashFile(file_path) for file_path in paths]
+    uploaded = _findUploadedComponents(session, set(hashes))
+
+    componentIds = []
+    components = []
+    for item, file_path, content_hash in zip(files, paths, hashes):
+        # Frames with the same content in this batch are uploaded
+        # separately as each is attached to the note once.
+        if (
+            content_hash in uploaded and
+            uploaded[content_hash] not in componentIds
+        ):
+            componentId = uploaded[content_hash]
+            logger.info(u'Reusing component {0!r} for {1!r}'.format(
+                componentId, file_path
+            ))
+            annotation_components[componentId] = (
+                None, file_path, content_hash
+            )
+            componentIds.append(componentId)
+            continue
+
+        logger.info(u'Creating component: {0!r}'.format(
+            file_path
+        ))
+        component = session.create('FileComponent', {
+            'name': 'Frame_{0}'.format(item['frame']),
+            'file_type': os.path.splitext(file_path)[-1],
+            'size': os.path.getsize(file_path)
+        })
+        components.append((component, file_path, content_hash))
+        componentIds.append(component['id'])
+
+    if components:
+        session.commit()
+
+    for component, file_path, content_hash in components:
+        annotation_components[component['id']] = (
+            component, file_path, content_hash
+        )
+
+    return componentIds
 
 
-def getNavigationURL(params=None):
-    '''Return URL to navigation panel based on *params*.'''
-    return _generateURL(params, 'review_navigation')
+def _getUploadExecutor():
+    '''Return executor running annotation uploads.'''
+    global uploadExecutor
 
+    if uploadExecutor is None:
+        workers = UPLOAD_WORKERS
+        try:
+            workers = max(int(_readSetting('uploadWorkers', workers)), 1)
+        except (TypeError, ValueError):
+            pass
 
-def getActionURL(params=None):
-    '''Return URL to action panel based on *params*.'''
-    return _generateURL(params, 'review_action')
+        uploadExecutor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers
+        )
 
+    return uploadExecutor
 
-def _translateEntityType(entityType):
-    '''Return translated entity type tht can be used with API.'''
-    # Get entity type and make sure it is lower cased. Most places except
-    # the component tab in the Sidebar will use lower case notation.
-    entity_type = entityType.replace('_', '').lower()
 
-    for schema in session.schemas:
-        alias_for = schema.get('alias_for')
+def _sendUploadEvent(data):
+    '''Send upload *data* to the panels from RV's main thread.'''
+    _callLater(lambda: _sendFtrackEvent(data))
 
-        if (
-            alias_for and isinstance(alias_for, str) and
-            alias_for.lower() == entity_type
-        ):
-            return schema['id']
 
-    for schema in session.schemas:
-        if schema['id'].lower() == entity_type:
-                return schema['id']
+def _transferComponent(component_id, file_path):
+    '''Add file at *file_path* to the server location for *component_id*.
 
-    raise ValueError(
-        'Unable to translate entity type: {0}.'.format(entity_type)
-    )
+    Transfer of large files in parts is left to the server location of
+    ftrack_api.
 
-def _get_temp_data_url(name, temp_data_id):
-    operation = {
-        'action': 'get_widget_url',
-        'name': name,
-        'theme': None,
-    }
+    '''
+    workerSession = _getSession()
+    component = workerSession.get('Component', component_id)
+    workerOriginLocation = workerSession.get(
+        'Location', ftrack_api.symbol.ORIGIN_LOCATION_ID
+    )
+    workerServerLocation = workerSession.get(
+        'Location', ftrack_api.symbol.SERVER_LOCATION_ID
+    )
 
-    result = session.call([operation])
-    url = result[0]['widget_url']
-    full_url = '{}&entityType=tempdata&entityId={}'.format(url, temp_data_id)
-    return full_url
+    try:
+        workerOriginLocation.add_component(
+            component, file_path, recursive=False
+        )
+    except ftrack_api.exception.ComponentInLocationError:
+        # Registered by an earlier attempt, the session keeps the origin
+        # location between attempts.
+        pass
 
-def _generateURL(params=None, panelName=None):
-    '''Return URL to panel in ftrack based on *params* or *panel*.'''
-    logger.info('_generateURL with params: {}'.format(params))
-    url = ''
     try:
-        entityId = None
-        entityType = None
+        workerServerLocation.add_component(component, workerOriginLocation)
+    except ftrack_api.exception.ComponentInLocationError:
+        # Uploaded by an earlier attempt that failed to report back.
+        logger.info(
+            u'Component {0!r} already in ftrack server location.'.format(
+                component_id
+            )
+        )
 
-        if params:
-            panelName = panelName or params
-            try:
-                params = json.loads(params)
-                entityId = params['entityId'][0]
-                entityType = params['entityType'][0]
-            except Exception:
-                entityId, entityType = _getEntityFromEnvironment()
 
-            if (entityId and entityType):
-                if (entityType != 'tempdata') :   
-                    new_entity_type = _translateEntityType(entityType)
-                    new_entity = session.get(new_entity_type, entityId)
-                    try:
-                        url = session.get_widget_url(panelName, entity=new_entity)
-                    except Exception as exception:
-                        logger.error(str(exception))
-                else: 
-                    try:
-                        url = _get_temp_data_url(panelName, entityId)
-                    except Exception as exception:
-                        logger.error(str(exception))
+@profiler.timed()
+def _uploadComponent(component_id, file_path, content_hash=None):
+    '''Upload file at *file_path* for component with *component_id*.
 
-        logger.info('Returning url "{0}"'.format(url))
-    except Exception as error:
-        logger.exception('Failed to generate URL. {}'.format(error))
-    return url
+    Run in an upload worker thread. Failed attempts are retried with an
+    exponential backoff and the upload is removed from the persistent queue
+    once done. Exported frames are removed once uploaded and the component
+    is added to the upload index under *content_hash*.
 
+    '''
+    _sendUploadEvent({
+        'type': 'uploadProgress', 'id': component_id, 'status': 'uploading'
+    })
+
+    success = False
+    for attempt in range(UPLOAD_RETRIES + 1):
+        if attempt:
+            delay = UPLOAD_RETRY_DELAY * 2 ** (attempt - 1)
+            logger.warning(
+                u'Retrying upload of component {0!r} in {1} seconds.'.format(
+                    component_id, delay
+                )
+            )
+            _sendUploadEvent({
+                'type': 'uploadProgress', 'id': component_id,
+                'status': 'retrying', 'attempt': attempt
+            })
+            time.sleep(delay)
 
-def ftrackFilePath(id):
-    try:
-        if id != "":
-            filename = "%s.jpg" % id
-            filepath = os.path.join(tempfile.gettempdir(), filename)
+        try:
+            _transferComponent(component_id, file_path)
+        except Exception:
+            logger.exception(
+                'Failed to upload component {0!r}'.format(component_id)
+            )
         else:
-            filepath = tempfile.gettempdir()
-        return filepath
-    except Exception:
-        logger.exception('Failed to get file path.')
-        return ''
+            success = True
+            break
 
+    if success:
+        if uploadQueue is not None:
+            uploadQueue.remove(component_id)
 
-def ftrackUUID(short):
-    '''Retun a uuid based on uuid1
-    '''
-    return str(uuid())
+        if uploadIndex is not None and content_hash is not None:
+            uploadIndex.set(_getUploadIndexKey(content_hash), component_id)
 
+        _removeExportedFile(file_path)
 
-def ftrackJumpTo(index=0, startFrame=1):
-    '''Move playhead to an index
+    with uploadCountsLock:
+        uploadCounts['completed'] += 1
+        completed = uploadCounts['completed']
+        total = uploadCounts['total']
+        if completed == total:
+            uploadCounts['total'] = uploadCounts['completed'] = 0
 
-    Moves the RV playhead to the specified *index*
+    if not success:
+        _sendUploadEvent({'type': 'uploadFailed', 'id': component_id})
 
-    '''
-    try:
-        index = int(index)
-        frameNumber = 0
+    _sendUploadEvent({
+        'type': 'uploadProgress', 'id': component_id,
+        'status': 'done' if success else 'failed',
+        'completed': completed, 'total': total
+    })
+    _sendUploadEvent({
+        'type': 'uploadEnded', 'id': component_id, 'success': success
+    })
 
-        for idx, source in enumerate(rv.commands.nodesOfType('RVFileSource')):
-            if not idx >= index:
-                data = rv.commands.sourceMediaInfoList(source)[0]
-                add = (data.get('endFrame', 0) - data.get('startFrame', 0)) + 1
-                add = 1 if add == 0 else add
-                frameNumber += (add)
 
-        rv.commands.setFrame(frameNumber + startFrame)
+def _queueUpload(component_id, file_path, content_hash=None):
+    '''Submit upload of *file_path* for *component_id* to the executor.'''
+    with uploadCountsLock:
+        uploadCounts['total'] += 1
+
+    _getUploadExecutor().submit(
+        _uploadComponent, component_id, file_path, content_hash
+    )
+
+
+def _isProcessRunning(pid):
+    '''Return whether a process with *pid* is running on this host.'''
+    try:
+        if sys.platform == 'win32':
+            return _isWindowsProcessRunning(pid)
+
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
     except Exception:
-        logger.exception('Failed to jump to index.')
+        # Unable to tell, or not permitted to signal a running process,
+        # assume it is to avoid uploading twice.
+        return True
 
+    return True
 
-def create_component(encoded_args):
-    '''Create component without adding it to a location.
 
-    *encoded_args* should be a JSON encoded dictionary containing file_name and
-    frame.
+def _isWindowsProcessRunning(pid):
+    '''Return whether a process with *pid* is running on Windows.
+
+    os.kill can not be used as signal 0 is CTRL_C_EVENT on Windows, so the
+    process is opened to query its exit code instead.
 
-    Store reference in annotation_components.
     '''
-    component_id = None
+    import ctypes  # Inline import as only needed on Windows.
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    ERROR_ACCESS_DENIED = 5
+    STILL_ACTIVE = 259
+
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.OpenProcess(
+        PROCESS_QUERY_LIMITED_INFORMATION, False, int(pid)
+    )
+    if not handle:
+        # The process exists if it is only not accessible.
+        return kernel32.GetLastError() == ERROR_ACCESS_DENIED
+
     try:
-        args = json.loads(encoded_args)
-        file_name = args['file_name']
-        frame = args['frame']
+        exitCode = ctypes.c_ulong()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exitCode)):
+            return True
 
-        component_name = 'Frame_{0}'.format(frame)
-        file_path = os.path.join(ftrackFilePath(''), file_name)
-        logger.info(u'Creating component: {0!r}'.format(
-            file_path
-        ))
-        component = session.create_component(
-            path=file_path,
-            data=dict(name=component_name),
-            location=None
+        return exitCode.value == STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def _resumeUploads():
+    '''Resume uploads left in the persistent queue by earlier sessions.
+
+    Only uploads queued against the same ftrack server by RV processes of
+    this host that are no longer running are resumed.
+
+    '''
+    if uploadQueue is None:
+        return
+
+    for component_id, entry in uploadQueue.items().items():
+        if (
+            entry.get('server') != os.environ.get('FTRACK_SERVER') or
+            entry.get('host') != socket.gethostname() or
+            entry.get('pid') == os.getpid() or
+            _isProcessRunning(entry.get('pid'))
+        ):
+            continue
+
+        if not os.path.exists(entry['path']):
+            logger.warning(
+                u'Dropping upload of component {0!r}, file {1!r} no longer '
+                u'exists.'.format(component_id, entry['path'])
+            )
+            uploadQueue.remove(component_id)
+            continue
+
+        logger.info(
+            u'Resuming upload of component {0!r}.'.format(component_id)
         )
-        component_id = component['id']
-        annotation_components[component_id] = component
-    except Exception:
-        logger.exception('Failed to create component.')
 
-    return component_id
+        # Claim the upload for this process.
+        entry['pid'] = os.getpid()
+        uploadQueue.set(component_id, entry)
 
+        _sendFtrackEvent({
+            'type': 'uploadProgress', 'id': component_id, 'status': 'queued'
+        })
+        _queueUpload(component_id, entry['path'], entry.get('hash'))
 
+
+@profiler.timed()
 def upload_component(component_id):
-    '''Add component with *component_id* to ftrack server location.'''
+    '''Queue component with *component_id* for the ftrack server location.
+
+    The upload runs in a worker thread and its progress is reported to the
+    panels with ``uploadProgress`` events, followed by an ``uploadEnded``
+    event once done. Components reused from an earlier upload of the same
+    content are reported as done right away. Return *component_id* if the
+    upload was queued.
+
+    '''
     try:
+        component, file_path, content_hash = annotation_components.pop(
+            component_id
+        )
+
+        if component is None:
+            logger.info(
+                u'Component {0!r} already in ftrack server location.'.format(
+                    component_id
+                )
+            )
+            _removeExportedFile(file_path)
+            _sendFtrackEvent({
+                'type': 'uploadProgress', 'id': component_id,
+                'status': 'done', 'reused': True
+            })
+            _sendFtrackEvent({
+                'type': 'uploadEnded', 'id': component_id, 'success': True
+            })
+            return component_id
+
         logger.info(u'Adding component {0!r} to ftrack server location.'.format(
             component_id
         ))
-        component = annotation_components[component_id]
-        server_location.add_component(component, origin_location)
-        del annotation_components[component_id]
+
+        if uploadQueue is not None:
+            uploadQueue.set(component_id, {
+                'path': file_path,
+                'hash': content_hash,
+                'server': os.environ.get('FTRACK_SERVER'),
+                'host': socket.gethostname(),
+                'pid': os.getpid()
+            })
+
+        _queueUpload(component_id, file_path, content_hash)
     except Exception:
         logger.exception('Failed to upload component')
     else:
+        _sendFtrackEvent({
+            'type': 'uploadProgress', 'id': component_id, 'status': 'queued'
+        })
         return component_id
+
+
+@profiler.timed()
+def upload_components(encoded_component_ids):
+    '''Queue several components for the ftrack server location.
+
+    *encoded_component_ids* is a JSON encoded list of component ids or the
+    mapping returned by create_components. An ``uploadStarted`` event is sent
+    for each component before it is queued.
+
+    '''
+    try:
+        component_ids = json.loads(encoded_component_ids)
+        if isinstance(component_ids, dict):
+            component_ids = list(component_ids.values())
+    except Exception:
+        logger.exception('Failed to decode components to upload.')
+        return
+
+    for component_id in component_ids:
+        _sendFtrackEvent({'type': 'uploadStarted', 'attachment': component_id})
+        upload_component(component_id)
+
+
+def _findRvio():
+    '''Return path to the rvio executable or None if not found.'''
+    path = os.environ.get('RV_APP_RVIO')
+    if path and os.path.isfile(path):
+        return path
+
+    name = 'rvio.exe' if sys.platform == 'win32' else 'rvio'
+
+    # rvio is installed next to the RV executable running this interpreter.
+    path = os.path.join(os.path.dirname(sys.executable), name)
+    if os.path.isfile(path):
+        return path
+
+    return shutil.which(name)
+
+
+def _getExportWorkers():
+    '''Return number of rvio jobs to run at once.'''
+    try:
+        return max(int(_readSetting('exportWorkers', EXPORT_WORKERS)), 1)
+    except (TypeError, ValueError):
+        return EXPORT_WORKERS
+
+
+def _getExportExecutor():
+    '''Return executor running rvio jobs.'''
+    global exportExecutor
+
+    if exportExecutor is None:
+        exportExecutor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=_getExportWorkers()
+        )
+
+    return exportExecutor
+
+
+def _getExportSettings():
+    '''Return format, quality and maximum resolution of exported frames.'''
+    exportFormat = str(_readSetting('exportFormat', EXPORT_FORMAT)).lower()
+    if exportFormat not in EXPORT_FORMATS:
+        logger.warning(
+            u'Unsupported export format {0!r}, using {1}.'.format(
+                exportFormat, EXPORT_FORMAT
+            )
+        )
+        exportFormat = EXPORT_FORMAT
+
+    try:
+        quality = min(max(
+            int(_readSetting('exportQuality', EXPORT_QUALITY)), 1
+        ), 100)
+    except (TypeError, ValueError):
+        quality = EXPORT_QUALITY
+
+    try:
+        maxResolution = max(int(
+            _readSetting('exportMaxResolution', EXPORT_MAX_RESOLUTION)
+        ), 0)
+    except (TypeError, ValueError):
+        maxResolution = EXPORT_MAX_RESOLUTION
+
+    return exportFormat, quality, maxResolution
+
+
+def _getExportWidth(frames, maxResolution):
+    '''Return width to scale *frames* to, or None to keep their size.
+
+    Frames are scaled so that the largest source shown on any of them fits
+    *maxResolution*. Must be called from RV's main thread.
+
+    '''
+    if not maxResolution:
+        return None
+
+    width = height = 0
+    for frame in frames:
+        for source in rv.commands.sourcesAtFrame(frame):
+            try:
+                info = rv.commands.sourceMediaInfo(source)
+            except Exception:
+                continue
+
+            if max(info['width'], info['height']) > max(width, height):
+                width, height = info['width'], info['height']
+
+    if max(width, height) <= maxResolution:
+        return None
+
+    return max(int(round(width * maxResolution / float(max(width, height)))), 1)
+
+
+def _getExportOptions(frames):
+    '''Return file extension and rvio options to export *frames* with.
+
+    Must be called from RV's main thread.
+
+    '''
+    exportFormat, quality, maxResolution = _getExportSettings()
+
+    options = list(EXPORT_OPTIONS)
+    if exportFormat != 'png':
+        options += ['-quality', '{0:.2f}'.format(quality / 100.0)]
+
+    width = _getExportWidth(frames, maxResolution)
+    if width is not None:
+        options += ['-resize', str(width)]
+
+    return exportFormat, options
+
+
+def export_options(encoded_frames):
+    '''Return file extension and rvio options to export frames with.
+
+    *encoded_frames* is the comma separated frames to export. The extension
+    and options are returned separated by ``|``.
+
+    '''
+    frames = [int(frame) for frame in encoded_frames.split(',') if frame]
+    extension, options = _getExportOptions(frames)
+    return '|'.join([extension] + options)
+
+
+def _removeExportedFile(file_path):
+    '''Remove *file_path* if it was exported by this plugin.'''
+    directory = os.path.realpath(ftrackFilePath(''))
+    if os.path.dirname(os.path.realpath(file_path)) != directory:
+        return
+
+    try:
+        os.remove(file_path)
+    except OSError:
+        logger.warning(u'Failed to remove {0!r}.'.format(file_path))
+
+
+def _cleanExportDirectory():
+    '''Remove exported frames left by earlier sessions.
+
+    Files older than EXPORT_FILE_TTL seconds are removed unless they are
+    still queued for upload.
+
+    '''
+    directory = ftrackFilePath('')
+    if not directory:
+        return
+
+    queued = set()
+    if uploadQueue is not None:
+        queued = set(
+            os.path.realpath(entry['path'])
+            for entry in uploadQueue.items().values()
+        )
+
+    threshold = time.time() - EXPORT_FILE_TTL
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        try:
+            if (
+                os.path.getmtime(path) < threshold and
+                os.path.realpath(path) not in queued
+            ):
+                os.remove(path)
+        except OSError:
+            logger.warning(u'Failed to remove {0!r}.'.format(path))
+
+
+def _exportFrames(rvio, sessionPath, directory, prefix, frames, extension,
+                  options):
+    '''Export *frames* of *sessionPath* with a single rvio job.
+
+    Frames are written as *extension* files with rvio *options*. Return
+    list of dictionaries with file_name and frame of the frames that were
+    exported.
+
+    '''
+    command = [
+        rvio, sessionPath,
+        '-o', os.path.join(directory, '{0}_#.{1}'.format(prefix, extension)),
+        '-t', ','.join(str(frame) for frame in frames)
+    ] + options
+
+    with profiler.span('rvio export'):
+        process = subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+        output = process.communicate()[0]
+
+    if process.returncode != 0:
+        logger.error(
+            u'rvio exited with {0} exporting frames {1}: {2}'.format(
+                process.returncode, frames,
+                output.decode('utf-8', 'replace')
+            )
+        )
+
+    exported = []
+    for frame in frames:
+        file_name = '{0}_{1:04d}.{2}'.format(prefix, frame, extension)
+        if os.path.exists(os.path.join(directory, file_name)):
+            exported.append({'file_name': file_name, 'frame': frame})
+
+    return exported
+
+
+def _uploadExportedFrames(exported):
+    '''Create components for *exported* frames and queue their upload.
+
+    Components are created on the api worker as the session is shared, then
+    queued for upload from RV's main thread.
+
+    '''
+    if not exported:
+        return
+
+    def queue(future):
+        try:
+            componentIds = future.result()
+        except Exception:
+            logger.exception('Failed to create components for frames.')
+            return
+
+        _callLater(lambda: upload_components(json.dumps(componentIds)))
+
+    _getApiExecutor().submit(_createComponents, exported).add_done_callback(
+        queue
+    )
+
+
+def _runExport(rvio, sessionPath, directory, prefix, jobs):
+    '''Export *jobs* with parallel rvio jobs and upload the frames.
+
+    *jobs* is a list of frames, file extension and rvio options for each
+    job. Frames of each job are uploaded as soon as the job is done. Frames
+    missing once all jobs are done are exported again one job at a time.
+
+    '''
+    executor = _getExportExecutor()
+    futures = dict(
+        (
+            executor.submit(
+                _exportFrames, rvio, sessionPath, directory, prefix, *job
+            ),
+            job
+        )
+        for job in jobs
+    )
+
+    missing = []
+    for future in concurrent.futures.as_completed(futures):
+        frames, extension, options = futures[future]
+        try:
+            exported = future.result()
+        except Exception:
+            logger.exception('Failed to export frames.')
+            exported = []
+
+        _uploadExportedFrames(exported)
+
+        done = set(item['frame'] for item in exported)
+        remaining = [frame for frame in frames if frame not in done]
+        if remaining:
+            missing.append((remaining, extension, options))
+
+    if len(jobs) > 1:
+        retried = []
+        for frames, extension, options in missing:
+            logger.warning(
+                'Exporting frames {0} again in a single job.'.format(frames)
+            )
+            exported = _exportFrames(
+                rvio, sessionPath, directory, prefix, frames, extension,
+                options
+            )
+            _uploadExportedFrames(exported)
+
+            done = set(item['frame'] for item in exported)
+            retried.extend(frame for frame in frames if frame not in done)
+    else:
+        retried = [frame for job in missing for frame in job[0]]
+
+    for frame in retried:
+        logger.error('Failed to export frame {0}.'.format(frame))
+
+
+@profiler.timed()
+def export_frames(encoded_args):
+    '''Export and upload annotated frames with parallel rvio jobs.
+
+    *encoded_args* is the path of the RV session file to export from, the
+    file name prefix and the comma separated frames, separated by ``;``.
+    Frames are written to ftrackFilePath as ``prefix_0001.jpg``, with the
+    extension and options of _getExportOptions, and are uploaded as with
+    upload_components.
+
+    Return ``ok`` if the export was started, or an empty string if rvio
+    could not be found so that the caller can export with a single job.
+
+    '''
+    try:
+        sessionPath, prefix, frames = encoded_args.split(';')
+        frames = [int(frame) for frame in frames.split(',') if frame]
+    except ValueError:
+        logger.exception(u'Invalid export {0!r}.'.format(encoded_args))
+        return ''
+
+    rvio = _findRvio()
+    if rvio is None:
+        logger.warning('rvio not found, can not export frames in parallel.')
+        return ''
+
+    if not frames:
+        return 'ok'
+
+    # Split frames into contiguous chunks, one per job, as each rvio process
+    # loads the whole session. Options are resolved here as they depend on
+    # the sources shown on the frames.
+    workers = min(_getExportWorkers(), len(frames))
+    size = int(math.ceil(len(frames) / float(workers)))
+    jobs = []
+    for offset in range(0, len(frames), size):
+        chunk = frames[offset:offset + size]
+        jobs.append((chunk,) + _getExportOptions(chunk))
+
+    thread = threading.Thread(
+        target=_runExport,
+        args=(rvio, sessionPath, ftrackFilePath(''), prefix, jobs)
+    )
+    thread.start()
+
+    return 'ok'
+
+
+# Start creating the session and resolving panel URLs in the background.
+_startup()
+
+# Resume uploads interrupted by an earlier session once RV is idle.
+_callLater(_resumeUploads)
@@ -60,7 +60,18 @@ STAGING_PATH = STAGING_PATH.format(VERSION)
 class BuildPlugin(Command):
     '''Build plugin.'''
     description = 'Download dependencies and build plugin .'
-    user_options = []
+    user_options = [
+        (
+            'precompile', None,
+            'Ship dependencies with precompiled bytecode for faster import.'
+        ),
+        (
+            'python-executable=', None,
+            'Interpreter used to precompile dependencies, should match the '
+            'Python version of RV [default: current interpreter].'
+        ),
+    ]
+    boolean_options = ['precompile']
 
     def copytree(self, src, dst, symlinks=False, ignore=None):
         for item in os.listdir(src):
@@ -74,10 +85,28 @@ class BuildPlugin(Command):
     def initialize_options(self):
         '''Initialize options.'''
         self.rvpkg_staging = os.path.join(tempfile.mkdtemp(), 'rvpkg')
+        self.precompile = False
+        self.python_executable = None
 
     def finalize_options(self):
         '''Finalize options.'''
-        pass
+        if self.python_executable is None:
+            self.python_executable = sys.executable
+
+    def _precompile_dependencies(self, dependencies_path):
+        '''Compile bytecode next to the sources in *dependencies_path*.
+
+        Modules imported from a zip can not cache bytecode, so without it
+        every dependency is compiled again each time RV starts. Bytecode is
+        written next to the sources as that is where zipimport looks for it.
+
+        '''
+        subprocess.check_call(
+            [
+                self.python_executable, '-m', 'compileall', '-b', '-q',
+                dependencies_path
+            ]
+        )
 
     def _build_release(self):
         '''Copy the hook and the source code.'''
@@ -169,6 +198,11 @@ class BuildPlugin(Command):
             os.path.join(self.rvpkg_staging, 'dependencies')]
         )
 
+        if self.precompile:
+            self._precompile_dependencies(
+                os.path.join(self.rvpkg_staging, 'dependencies')
+            )
+
         shutil.make_archive(
             os.path.join(self.rvpkg_staging, 'dependencies'),
             'zip',
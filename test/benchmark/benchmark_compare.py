@@ -0,0 +1,108 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 ftrack
+
+'''Measure entering compare modes at different latencies.
+
+A cold compare starts from an empty session and resolves both component
+paths from the server, a warm compare enters the mode again for the same
+pair and a switch changes from another mode to it.
+
+Grids of different numbers of tiles are measured the same way.
+
+Run with ``python test/benchmark/benchmark_compare.py``.
+'''
+
+import time
+
+import harness
+
+
+MODES = ('wipe', 'sidebyside', 'load')
+LATENCIES = (0.0, 0.01, 0.05)
+TILES = (4, 9, 16)
+
+
+def run():
+    fake, api = harness.load_plugin()
+
+    print('{0:>12} {1:>12} {2:>12} {3:>8} {4:>12} {5:>8} {6:>12}'.format(
+        'mode', 'latency (s)', 'cold (ms)', 'trips', 'warm (ms)', 'trips',
+        'switch (ms)'
+    ))
+
+    data = {'componentIdA': 'component-a', 'componentIdB': 'component-b'}
+
+    for mode in MODES:
+        for latency in LATENCIES:
+            harness.set_latency(latency)
+
+            def compare():
+                api.ftrackCompare(dict(data, mode=mode))
+
+            def cold():
+                harness.reset(fake, api)
+                compare()
+
+            cold_time = harness.measure(cold)
+            cold_trips = harness.round_trips()
+
+            trips = harness.round_trips()
+            warm_time = harness.measure(compare)
+            warm_trips = (harness.round_trips() - trips) // 3
+
+            other = MODES[MODES.index(mode) - 1]
+
+            def switch():
+                api.ftrackCompare(dict(data, mode=other))
+                start = time.perf_counter()
+                compare()
+                return time.perf_counter() - start
+
+            switch_time = min(switch() for _ in range(3))
+
+            print(
+                '{0:>12} {1:>12.3f} {2:>12.3f} {3:>8} {4:>12.3f} {5:>8} '
+                '{6:>12.3f}'.format(
+                    mode, latency, cold_time * 1000, cold_trips,
+                    warm_time * 1000, warm_trips, switch_time * 1000
+                )
+            )
+
+    print('\n{0:>12} {1:>12} {2:>12} {3:>8} {4:>12} {5:>8}'.format(
+        'tiles', 'latency (s)', 'cold (ms)', 'trips', 'warm (ms)', 'trips'
+    ))
+
+    for tiles in TILES:
+        grid = {
+            'mode': 'grid',
+            'componentIds': [
+                'component-{0:02d}'.format(index) for index in range(tiles)
+            ]
+        }
+
+        for latency in LATENCIES:
+            harness.set_latency(latency)
+
+            def cold_grid():
+                harness.reset(fake, api)
+                api.ftrackCompare(grid)
+
+            cold_time = harness.measure(cold_grid)
+            cold_trips = harness.round_trips()
+
+            trips = harness.round_trips()
+            warm_time = harness.measure(lambda: api.ftrackCompare(grid))
+            warm_trips = (harness.round_trips() - trips) // 3
+
+            print(
+                '{0:>12} {1:>12.3f} {2:>12.3f} {3:>8} {4:>12.3f} {5:>8}'.format(
+                    tiles, latency, cold_time * 1000, cold_trips,
+                    warm_time * 1000, warm_trips
+                )
+            )
+
+    harness.set_latency(0.0)
+
+
+if __name__ == '__main__':
+    run()
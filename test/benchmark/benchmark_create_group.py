@@ -0,0 +1,47 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 ftrack
+
+'''Compare per-track and bulk source insertion when creating a group.
+
+Run with ``python test/benchmark/benchmark_create_group.py``.
+'''
+
+import harness
+
+
+SIZES = (10, 100, 1000)
+
+
+def run():
+    fake, api = harness.load_plugin()
+    addSourcesVerbose = api.rv.commands.addSourcesVerbose
+
+    print('{0:>8} {1:>14} {2:>14} {3:>10}'.format(
+        'tracks', 'per-track (s)', 'bulk (s)', 'speedup'
+    ))
+
+    for size in SIZES:
+        tracks = ['/mnt/projects/shot{0:04d}.mov'.format(index)
+                  for index in range(size)]
+
+        def create_group():
+            harness.reset(fake, api)
+            api._ftrackCreateGroup(
+                tracks, api._getSourceNode('sequence'), 'defaultLayout'
+            )
+
+        del api.rv.commands.addSourcesVerbose
+        try:
+            per_track = harness.measure(create_group)
+        finally:
+            api.rv.commands.addSourcesVerbose = addSourcesVerbose
+
+        bulk = harness.measure(create_group)
+
+        print('{0:>8} {1:>14.4f} {2:>14.4f} {3:>9.1f}x'.format(
+            size, per_track, bulk, per_track / bulk
+        ))
+
+
+if __name__ == '__main__':
+    run()
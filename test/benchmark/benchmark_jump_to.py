@@ -0,0 +1,59 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 ftrack
+
+'''Measure jumping to playlist items in playlists of different sizes.
+
+Jumps use the frame offsets of a playlist loaded with loadPlaylist. The
+fallback walking all file sources, used for sources not loaded as a
+playlist, is measured for comparison. Work a jump defers until RV is idle,
+such as prefetching media, is measured separately.
+
+Run with ``python test/benchmark/benchmark_jump_to.py``.
+'''
+
+import random
+
+import harness
+
+
+SIZES = (10, 100, 1000)
+JUMPS = 200
+
+
+def run():
+    fake, api = harness.load_plugin()
+    harness.set_latency(0.0)
+
+    print('{0:>8} {1:>16} {2:>16} {3:>16} {4:>10}'.format(
+        'items', 'offsets (ms)', 'idle (ms)', 'walk (ms)', 'speedup'
+    ))
+
+    for size in SIZES:
+        harness.reset(fake, api)
+        api.loadPlaylist(harness.playlist(size), progressive=False)
+
+        indices = [random.randrange(size) for _ in range(JUMPS)]
+
+        def jump():
+            for index in indices:
+                api.ftrackJumpTo(index)
+
+        with harness.deferred(api) as dispatcher:
+            offsets = harness.measure(jump) / JUMPS
+            queued = len(dispatcher.dispatched.pending)
+            idle = harness.measure(dispatcher.run_idle, repeat=1) / queued
+
+        playlistSourceGroups = api.playlistSourceGroups
+        api.playlistSourceGroups = []
+        try:
+            walk = harness.measure(jump, repeat=1) / JUMPS
+        finally:
+            api.playlistSourceGroups = playlistSourceGroups
+
+        print('{0:>8} {1:>16.4f} {2:>16.4f} {3:>16.4f} {4:>9.1f}x'.format(
+            size, offsets * 1000, idle * 1000, walk * 1000, walk / offsets
+        ))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,77 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 ftrack
+
+'''Measure loading playlists of different sizes at different latencies.
+
+A full load starts from an empty session. A reload loads the same playlist
+again with a tenth of its items replaced, as happens when a list is edited
+in the panels. Playlists are loaded at once and progressively, where load
+times include the idle steps streaming in the items.
+
+Run with ``python test/benchmark/benchmark_load_playlist.py``.
+'''
+
+import harness
+
+
+SIZES = (10, 100, 1000)
+LATENCIES = (0.0, 0.01, 0.05)
+MODES = ('batch', 'progressive')
+
+
+def run():
+    fake, api = harness.load_plugin()
+
+    print(
+        '{0:>8} {1:>12} {2:>12} {3:>12} {4:>8} {5:>8} {6:>12} {7:>8}'.format(
+            'items', 'mode', 'latency (s)', 'load (s)', 'trips', 'rewires',
+            'reload (s)', 'trips'
+        )
+    )
+
+    for size in SIZES:
+        items = harness.playlist(size)
+        edited = list(items)
+        edited[::10] = harness.playlist(len(edited[::10]), prefix='edited')
+
+        for mode in MODES:
+            progressive = mode == 'progressive'
+
+            def load_playlist(playlist):
+                with harness.deferred(api):
+                    api.loadPlaylist(playlist, progressive=progressive)
+
+            for latency in LATENCIES:
+                harness.set_latency(latency)
+
+                def load():
+                    harness.reset(fake, api)
+                    load_playlist(items)
+
+                load_time = harness.measure(load)
+                load_trips = harness.round_trips()
+                rewires = fake.calls.get('setNodeInputs', 0)
+
+                def measure_reload():
+                    load()
+                    trips = harness.round_trips()
+                    duration = harness.measure(
+                        lambda: load_playlist(edited), repeat=1
+                    )
+                    return duration, harness.round_trips() - trips
+
+                reload_time, reload_trips = measure_reload()
+
+                print(
+                    '{0:>8} {1:>12} {2:>12.3f} {3:>12.4f} {4:>8} {5:>8} '
+                    '{6:>12.4f} {7:>8}'.format(
+                        size, mode, latency, load_time, load_trips, rewires,
+                        reload_time, reload_trips
+                    )
+                )
+
+    harness.set_latency(0.0)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,102 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 ftrack
+
+'''Measure creating and uploading annotation frames at different latencies.
+
+Frames are created with a single create_components call and uploaded by
+upload_components, timing until every upload has reported uploadEnded. The
+same frames are then sent again, reusing the uploaded components.
+
+Run with ``python test/benchmark/benchmark_upload.py``.
+'''
+
+import os
+import json
+import shutil
+import tempfile
+
+import harness
+
+
+SIZES = (1, 10, 50)
+LATENCIES = (0.0, 0.01, 0.05)
+
+
+def run():
+    fake, api = harness.load_plugin()
+
+    directory = tempfile.mkdtemp(prefix='ftrack-rv-benchmark-')
+    ftrackFilePath = api.ftrackFilePath
+    api.ftrackFilePath = lambda id: directory
+
+    print('{0:>8} {1:>12} {2:>12} {3:>12} {4:>8} {5:>12} {6:>12}'.format(
+        'frames', 'latency (s)', 'create (s)', 'upload (s)', 'trips',
+        'frames/s', 'resend (s)'
+    ))
+
+    try:
+        for size in SIZES:
+            for latency in LATENCIES:
+                harness.set_latency(latency)
+                harness.reset(fake, api)
+                api.uploadIndex = api.ftrack_cache.PersistentCache(
+                    os.path.join(directory, 'upload_index_{0}_{1}.db'.format(
+                        size, latency
+                    ))
+                )
+
+                def write():
+                    # Frames are removed once uploaded.
+                    files = []
+                    for frame in range(1, size + 1):
+                        file_name = 'annotation_{0:04d}.jpg'.format(frame)
+                        path = os.path.join(directory, file_name)
+                        with open(path, 'wb') as file:
+                            file.write(str(frame).encode() * 1024)
+                        files.append({'file_name': file_name, 'frame': frame})
+                    return files
+
+                files = write()
+                components = {}
+
+                def create():
+                    components.update(
+                        json.loads(api.create_components(json.dumps(files)))
+                    )
+
+                create_time = harness.measure(create, repeat=1)
+
+                def upload():
+                    api.upload_components(json.dumps(components))
+                    harness.wait_for_events(fake, 'uploadEnded', size)
+
+                upload_time = harness.measure(upload, repeat=1)
+                trips = harness.round_trips()
+
+                files = write()
+                fake.events = []
+
+                def resend():
+                    components.clear()
+                    create()
+                    upload()
+
+                resend_time = harness.measure(resend, repeat=1)
+
+                print(
+                    '{0:>8} {1:>12.3f} {2:>12.4f} {3:>12.4f} {4:>8} '
+                    '{5:>12.1f} {6:>12.4f}'.format(
+                        size, latency, create_time, upload_time, trips,
+                        size / (create_time + upload_time), resend_time
+                    )
+                )
+
+    finally:
+        api.ftrackFilePath = ftrackFilePath
+        api.uploadIndex = None
+        shutil.rmtree(directory, ignore_errors=True)
+        harness.set_latency(0.0)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,259 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 ftrack
+
+'''Local stand-in for the parts of :mod:`ftrack_api` used by ftrack_rv_api.
+
+Every method that would reach the ftrack server sleeps for
+:data:`latency` seconds and is counted in :data:`round_trips`, so
+benchmarks can compare implementations by the number of server calls as
+well as by wall time.
+'''
+
+import sys
+import time
+import types
+import uuid
+import datetime
+
+
+ORIGIN_LOCATION_ID = 'ce9b348f-8809-11e3-821c-20c9d081909b'
+SERVER_LOCATION_ID = '3a372bde-05bc-11e4-8908-20c9d081909b'
+DISK_LOCATION_ID = '0b2c8e8a-7f3e-11e4-8a7c-20c9d081909b'
+REMOTE_LOCATION_ID = '5d1f0c1e-7f3e-11e4-8a7c-20c9d081909b'
+
+#: Sentinel for unset values.
+NOT_SET = object()
+
+#: Stand-in for :mod:`ftrack_api.exception`, set by :func:`install`.
+exception = None
+
+#: Simulated server latency in seconds.
+latency = 0.0
+
+#: Number of simulated server round trips.
+round_trips = 0
+
+
+def _round_trip(session=None):
+    global round_trips
+    round_trips += 1
+    if latency:
+        time.sleep(latency)
+
+    if session is not None:
+        response = Response(datetime.timedelta(seconds=latency))
+        for hook in session._request.hooks['response']:
+            hook(response)
+
+
+class Response(object):
+    '''Response passed to request hooks.'''
+
+    def __init__(self, elapsed):
+        self.elapsed = elapsed
+
+
+class Request(object):
+    '''Requests session holding response hooks.'''
+
+    def __init__(self):
+        self.hooks = {'response': []}
+
+
+class Accessor(object):
+    '''Disk accessor mapping resource identifiers below *prefix*.'''
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+
+    def get_filesystem_path(self, resource_identifier):
+        return '{0}/{1}'.format(self.prefix, resource_identifier)
+
+
+class Entity(dict):
+    '''Entity represented as a plain dictionary.'''
+
+    entity_type = 'Entity'
+
+
+class Location(Entity):
+    '''Location storing components under an accessor.'''
+
+    entity_type = 'Location'
+
+    def __init__(self, session, data, accessor=NOT_SET, priority=95):
+        super(Location, self).__init__(data)
+        self.session = session
+        self.accessor = accessor
+        self.priority = priority
+        self.components = {}
+
+    def get_resource_identifiers(self, components):
+        _round_trip(self.session)
+        return [
+            '{0}.mov'.format(component['id']) for component in components
+        ]
+
+    def get_resource_identifier(self, component):
+        return self.get_resource_identifiers([component])[0]
+
+    def get_filesystem_path(self, component):
+        return self.accessor.get_filesystem_path(
+            self.get_resource_identifier(component)
+        )
+
+    def add_component(self, component, source, recursive=True):
+        return self.add_components([component], [source], recursive)
+
+    def add_components(self, components, sources, recursive=True):
+        _round_trip(self.session)
+        for component in components:
+            if component['id'] in self.components:
+                raise exception.ComponentInLocationError(component['id'])
+
+        for component in components:
+            self.components[component['id']] = component
+        return components
+
+
+class QueryResult(list):
+    '''Result of a query.'''
+
+    def all(self):
+        return list(self)
+
+    def first(self):
+        return self[0] if self else None
+
+    def one(self):
+        return self[0]
+
+
+class Session(object):
+    '''Session answering from local data instead of an ftrack server.'''
+
+    def __init__(self, *args, **kwargs):
+        self._request = Request()
+        _round_trip(self)
+        self.schemas = [
+            {'id': 'AssetVersion', 'alias_for': None},
+            {'id': 'AssetVersionList', 'alias_for': 'List'},
+            {'id': 'Project', 'alias_for': None},
+            {'id': 'ReviewSession', 'alias_for': None},
+            {'id': 'Task', 'alias_for': {'id': 'Task'}},
+        ]
+        self.locations = {
+            ORIGIN_LOCATION_ID: Location(
+                self, {'id': ORIGIN_LOCATION_ID, 'name': 'ftrack.origin'}
+            ),
+            SERVER_LOCATION_ID: Location(
+                self, {'id': SERVER_LOCATION_ID, 'name': 'ftrack.server'}
+            ),
+            DISK_LOCATION_ID: Location(
+                self, {'id': DISK_LOCATION_ID, 'name': 'studio.disk'},
+                accessor=Accessor('/mnt/projects'), priority=10
+            ),
+            REMOTE_LOCATION_ID: Location(
+                self, {'id': REMOTE_LOCATION_ID, 'name': 'studio.remote'},
+                accessor=Accessor('/mnt/remote'), priority=20
+            ),
+        }
+        self.created = []
+
+    def get(self, entity_type, entity_id):
+        # Locations are configured, and cached, when the session is created.
+        if entity_type == 'Location':
+            return self.locations[entity_id]
+
+        _round_trip(self)
+
+        entity = Entity(id=entity_id)
+        entity.entity_type = entity_type
+        return entity
+
+    def query(self, expression, page_size=None):
+        _round_trip(self)
+        result = QueryResult()
+        if expression.split(' where ')[0].endswith('Location'):
+            result.extend(self.locations.values())
+        elif 'version.components any' in expression:
+            # Every version has a main component and a proxy.
+            identifiers = expression.split(' in (', 1)[1].split(')', 1)[0]
+            for identifier in identifiers.split(','):
+                identifier = identifier.strip().strip('"')
+                version_id = 'version-{0}'.format(identifier)
+                result.append(Entity(
+                    id=identifier, name='main', version_id=version_id
+                ))
+                result.append(Entity(
+                    id='{0}-proxy'.format(identifier), name='proxy',
+                    version_id=version_id
+                ))
+        elif ' in (' in expression:
+            identifiers = expression.split(' in (', 1)[1].split(')', 1)[0]
+            for identifier in identifiers.split(','):
+                identifier = identifier.strip().strip('"')
+                if identifier:
+                    result.append(Entity(
+                        id=identifier,
+                        component_locations=[
+                            {'location_id': DISK_LOCATION_ID},
+                            {'location_id': REMOTE_LOCATION_ID},
+                        ]
+                    ))
+        return result
+
+    def pick_locations(self, components):
+        _round_trip(self)
+        return [self.locations[DISK_LOCATION_ID]] * len(components)
+
+    def pick_location(self, component=None):
+        return self.pick_locations([component])[0]
+
+    def create(self, entity_type, data=None):
+        entity = Entity(data or {})
+        entity.entity_type = entity_type
+        entity.setdefault('id', str(uuid.uuid4()))
+        self.created.append(entity)
+        return entity
+
+    def create_component(self, path, data=None, location='auto'):
+        _round_trip(self)
+        return self.create('FileComponent', dict(data or {}, path=path))
+
+    def commit(self):
+        _round_trip(self)
+        self.created = []
+
+    def call(self, operations):
+        _round_trip(self)
+        return [
+            {'widget_url': 'https://ftrack.example.com/widget?token=t'}
+            for _ in operations
+        ]
+
+    def get_widget_url(self, name, entity=None, theme=None):
+        _round_trip(self)
+        return 'https://ftrack.example.com/widget/{0}?token=t'.format(name)
+
+
+def install():
+    '''Install this module as :mod:`ftrack_api` and return it.'''
+    module = sys.modules[__name__]
+
+    symbol = types.ModuleType('ftrack_api.symbol')
+    symbol.ORIGIN_LOCATION_ID = ORIGIN_LOCATION_ID
+    symbol.SERVER_LOCATION_ID = SERVER_LOCATION_ID
+    symbol.NOT_SET = NOT_SET
+    module.symbol = symbol
+
+    exception = types.ModuleType('ftrack_api.exception')
+    exception.ComponentInLocationError = type(
+        'ComponentInLocationError', (Exception,), {}
+    )
+    module.exception = exception
+
+    sys.modules['ftrack_api'] = module
+    sys.modules['ftrack_api.symbol'] = symbol
+    sys.modules['ftrack_api.exception'] = exception
+    return module
@@ -0,0 +1,228 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 ftrack
+
+'''In memory stand-in for the :mod:`rv` modules used by ftrack_rv_api.
+
+The fake keeps a minimal node graph so that the plugin code can be driven
+outside of RV. Calls that rewire the graph copy the affected input lists,
+approximating the cost RV pays to re-evaluate connections.
+'''
+
+import sys
+import types
+
+
+class FakeRV(object):
+    '''Node graph and playhead state of a fake RV session.'''
+
+    def __init__(self, frames_per_source=48):
+        '''Initialise empty session with *frames_per_source* per movie.'''
+        self.frames_per_source = frames_per_source
+        self.nodes = {}
+        self.inputs = {}
+        self.groups = {}
+        self.media = {}
+        self.settings = {}
+        self.flags = {}
+        self.properties = {}
+        self.events = []
+        self.view_node = None
+        self.current_frame = 1
+        self.counters = {}
+        self.calls = {}
+
+        for name, node_type in (
+            ('defaultSequence', 'RVSequenceGroup'),
+            ('defaultStack', 'RVStackGroup'),
+            ('defaultLayout', 'RVLayoutGroup'),
+        ):
+            self.nodes[name] = node_type
+            self.inputs[name] = []
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def _name(self, prefix):
+        index = self.counters.get(prefix, 0)
+        self.counters[prefix] = index + 1
+        return '{0}{1:06d}'.format(prefix, index)
+
+    # rv.commands
+
+    def newNode(self, node_type, name=None):
+        self._count('newNode')
+        node = self._name(name or node_type)
+        self.nodes[node] = node_type
+        self.inputs[node] = []
+        return node
+
+    def deleteNode(self, node):
+        self._count('deleteNode')
+        members = [node] + [
+            member for member, group in self.groups.items() if group == node
+        ]
+        for member in members:
+            self.nodes.pop(member, None)
+            self.inputs.pop(member, None)
+            self.groups.pop(member, None)
+            self.media.pop(member, None)
+
+        for name, inputs in self.inputs.items():
+            if node in inputs:
+                self.inputs[name] = [item for item in inputs if item != node]
+
+    def nodesOfType(self, node_type):
+        self._count('nodesOfType')
+        return [
+            node for node, value in self.nodes.items() if value == node_type
+        ]
+
+    def nodeType(self, node):
+        return self.nodes[node]
+
+    def nodeExists(self, node):
+        return node in self.nodes
+
+    def nodeGroup(self, node):
+        return self.groups.get(node)
+
+    def nodesInGroup(self, group):
+        return [node for node, value in self.groups.items() if value == group]
+
+    def nodeConnections(self, node, traverse_groups=False):
+        self._count('nodeConnections')
+        outputs = [
+            name for name, inputs in self.inputs.items() if node in inputs
+        ]
+        return list(self.inputs.get(node, [])), outputs
+
+    def setNodeInputs(self, node, inputs):
+        self._count('setNodeInputs')
+        self.inputs[node] = list(inputs)
+
+    def _add_source(self, paths):
+        group = self._name('sourceGroup')
+        source = '{0}_source'.format(group)
+        self.nodes[group] = 'RVSourceGroup'
+        self.nodes[source] = 'RVFileSource'
+        self.inputs[group] = []
+        self.groups[source] = group
+        self.media[source] = list(paths)
+
+        # RV connects every new source to the default views.
+        for view in ('defaultSequence', 'defaultStack', 'defaultLayout'):
+            self.inputs[view] = self.inputs[view] + [group]
+
+        return source
+
+    def addSourceVerbose(self, paths, tag=None):
+        self._count('addSourceVerbose')
+        return self._add_source(paths)
+
+    def addSourcesVerbose(self, sources, tag=None):
+        self._count('addSourcesVerbose')
+        return [self._add_source(paths) for paths in sources]
+
+    def setSourceMedia(self, source, paths, tag=None):
+        self._count('setSourceMedia')
+        self.media[source] = list(paths)
+
+    def relocateSource(self, old_path, new_path, source=None):
+        self._count('relocateSource')
+        self.media[source] = [
+            new_path if path == old_path else path
+            for path in self.media[source]
+        ]
+
+    def sourceMedia(self, source):
+        return list(self.media[source]), [], []
+
+    def sourceMediaInfoList(self, source):
+        self._count('sourceMediaInfoList')
+        return [{'startFrame': 1, 'endFrame': self.frames_per_source}]
+
+    def sourceMediaInfo(self, source):
+        return {'width': 1920, 'height': 1080}
+
+    def setStringProperty(self, name, values, allow_resize=False):
+        self.properties[name] = list(values)
+
+    def setIntProperty(self, name, values, allow_resize=False):
+        self.properties[name] = list(values)
+
+    def setViewNode(self, node):
+        self._count('setViewNode')
+        self.view_node = node
+
+    def viewNode(self):
+        return self.view_node
+
+    def frame(self):
+        return self.current_frame
+
+    def setFrame(self, frame):
+        self._count('setFrame')
+        self.current_frame = frame
+
+    def sourcesAtFrame(self, frame):
+        return []
+
+    def sendInternalEvent(self, name, contents='', sender=None):
+        self.events.append((name, contents))
+        return ''
+
+    def readSettings(self, group, name, default):
+        return self.settings.get((group, name), default)
+
+    def writeSettings(self, group, name, value):
+        self.settings[(group, name)] = value
+
+    def commandLineFlag(self, name, default=None):
+        return self.flags.get(name, default)
+
+    # rv.extra_commands
+
+    def setUIName(self, node, name):
+        pass
+
+    def sourceFrame(self, frame, source=None):
+        return frame
+
+    # rv.runtime
+
+    def eval(self, text, modules=None):
+        return -1
+
+
+def install(fake=None):
+    '''Install *fake* as the :mod:`rv` package and return it.'''
+    fake = fake or FakeRV()
+
+    package = types.ModuleType('rv')
+    package.__path__ = []
+    modules = {'rv': package}
+
+    for name, attributes in (
+        ('commands', (
+            'newNode', 'deleteNode', 'nodesOfType', 'nodeType',
+            'nodeExists', 'nodeGroup', 'nodesInGroup', 'nodeConnections',
+            'setNodeInputs', 'addSourceVerbose', 'addSourcesVerbose',
+            'setSourceMedia', 'relocateSource', 'sourceMedia',
+            'sourceMediaInfoList', 'sourceMediaInfo', 'setStringProperty',
+            'setIntProperty', 'setViewNode', 'viewNode', 'frame',
+            'setFrame', 'sourcesAtFrame', 'sendInternalEvent',
+            'readSettings', 'writeSettings', 'commandLineFlag',
+        )),
+        ('extra_commands', ('setUIName', 'sourceFrame')),
+        ('runtime', ('eval',)),
+        ('rvtypes', ()),
+        ('rvui', ()),
+    ):
+        module = types.ModuleType('rv.{0}'.format(name))
+        for attribute in attributes:
+            setattr(module, attribute, getattr(fake, attribute))
+        setattr(package, name, module)
+        modules[module.__name__] = module
+
+    sys.modules.update(modules)
+    return fake
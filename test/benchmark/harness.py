@@ -0,0 +1,201 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 ftrack
+
+'''Load the RV plugin against the fake rv and ftrack_api modules.'''
+
+import os
+import sys
+import json
+import time
+import atexit
+import base64
+import shutil
+import tempfile
+import importlib
+import collections
+import contextlib
+
+import fake_rv
+import fake_ftrack_api
+
+
+PLUGIN_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', '..', 'resource', 'plugin'
+))
+
+
+# Fake rv session the plugin was imported against.
+_fake = None
+
+
+def load_plugin():
+    '''Return tuple of fake rv session and imported ftrack_rv_api module.
+
+    The plugin is imported once, with its caches and temporary files in a
+    directory removed on exit. Later calls return the same fake session
+    reset to an empty state.
+
+    '''
+    global _fake
+
+    if _fake is not None:
+        api = sys.modules['ftrack_rv_api']
+        reset(_fake, api)
+        return _fake, api
+
+    fake = _fake = fake_rv.install()
+    fake_ftrack_api.install()
+
+    os.environ.setdefault('FTRACK_SERVER', 'https://ftrack.example.com')
+    os.environ.setdefault('FTRACK_API_KEY', 'benchmark')
+    os.environ.setdefault('FTRACK_API_USER', 'benchmark')
+
+    if PLUGIN_PATH not in sys.path:
+        sys.path.insert(0, PLUGIN_PATH)
+
+    # Keep the caches and exported frames of the user out of reach, the
+    # plugin opens and cleans them up on import.
+    directory = tempfile.mkdtemp(prefix='ftrack-rv-benchmark-')
+    atexit.register(shutil.rmtree, directory, True)
+    tempfile.tempdir = directory
+
+    cache_directory = os.path.join(directory, 'cache')
+    os.makedirs(cache_directory)
+    ftrack_cache = importlib.import_module('ftrack_cache')
+    ftrack_cache.get_cache_directory = lambda: cache_directory
+
+    api = importlib.import_module('ftrack_rv_api')
+
+    # Let the startup steps finish so their round trips are not measured.
+    api.sessionFuture.result()
+    api._getApiExecutor().submit(lambda: None).result()
+    api._getLocationLatencies()
+    fake_ftrack_api.round_trips = 0
+
+    # Keep measurements independent of state persisted by earlier loads.
+    api.componentPathCache = None
+    api.uploadQueue = None
+    api.uploadIndex = None
+
+    return fake, api
+
+
+def reset(fake, api):
+    '''Reset *fake* graph and in memory caches of *api*.'''
+    fake.__init__(fake.frames_per_source)
+    api.componentFilesystemPaths.clear()
+    api.componentPathLocations.clear()
+    api.sequenceSourceNode = None
+    api.stackSourceNode = None
+    api.layoutSourceNode = None
+    api.gridSourceNode = None
+    api.compareSourceGroups.clear()
+    api.proxyComponents.clear()
+    api.mediaCacheSettings = None
+    api.playlistSourceGroups = []
+    api.playlistSourceGroupIndices = {}
+    api.playlistMediaPaths = set()
+    api.playlistFrameOffsets = [0]
+    api.sourceGroupFrameCounts.clear()
+    api.profiler.reset()
+    fake_ftrack_api.round_trips = 0
+
+
+class _Signal(object):
+    '''Signal queueing emitted callables.'''
+
+    def __init__(self):
+        self.pending = collections.deque()
+
+    def emit(self, function):
+        self.pending.append(function)
+
+
+class Dispatcher(object):
+    '''Stand-in for the Qt dispatcher of the plugin.
+
+    Calls scheduled with _callLater are queued until :meth:`run_idle`, as
+    RV's event loop would run them once idle.
+
+    '''
+
+    def __init__(self):
+        self.dispatched = _Signal()
+
+    def run_idle(self):
+        '''Run queued calls, including calls they schedule.'''
+        pending = self.dispatched.pending
+        while pending:
+            pending.popleft()()
+
+
+@contextlib.contextmanager
+def deferred(api):
+    '''Queue calls *api* schedules with _callLater in the yielded dispatcher.
+
+    Queued calls are run once the block exits.
+
+    '''
+    dispatcher = Dispatcher()
+    previous = api._dispatcher
+    api._dispatcher = dispatcher
+    try:
+        yield dispatcher
+        dispatcher.run_idle()
+    finally:
+        api._dispatcher = previous
+
+
+def set_latency(seconds):
+    '''Simulate *seconds* of latency for every ftrack server round trip.'''
+    fake_ftrack_api.latency = seconds
+
+
+def round_trips():
+    '''Return number of simulated server round trips since last reset.'''
+    return fake_ftrack_api.round_trips
+
+
+def playlist(size, prefix='component'):
+    '''Return playlist of *size* items as sent by the panels.'''
+    return [
+        {'componentId': '{0}-{1:06d}'.format(prefix, index)}
+        for index in range(size)
+    ]
+
+
+def ftrack_events(fake, event_type=None):
+    '''Return decoded ftrack-event data sent on *fake*, of *event_type*.'''
+    result = []
+    for name, contents in list(fake.events):
+        if name != 'ftrack-event':
+            continue
+        data = json.loads(base64.b64decode(contents).decode('utf-8'))
+        if event_type is None or data.get('type') == event_type:
+            result.append(data)
+    return result
+
+
+def wait_for_events(fake, event_type, count, timeout=60):
+    '''Wait until *count* ftrack events of *event_type* have been sent.'''
+    end = time.time() + timeout
+    while len(ftrack_events(fake, event_type)) < count:
+        if time.time() > end:
+            raise RuntimeError(
+                'Timed out waiting for {0} {1} events.'.format(
+                    count, event_type
+                )
+            )
+        time.sleep(0.001)
+
+
+def measure(function, repeat=3):
+    '''Return best wall time in seconds of calling *function* *repeat* times.
+    '''
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        duration = time.perf_counter() - start
+        best = duration if best is None else min(best, duration)
+    return best
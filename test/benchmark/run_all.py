@@ -0,0 +1,32 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 ftrack
+
+'''Run all benchmarks.
+
+Run with ``python test/benchmark/run_all.py``.
+'''
+
+import benchmark_create_group
+import benchmark_load_playlist
+import benchmark_compare
+import benchmark_jump_to
+import benchmark_upload
+
+
+BENCHMARKS = (
+    benchmark_create_group,
+    benchmark_load_playlist,
+    benchmark_compare,
+    benchmark_jump_to,
+    benchmark_upload,
+)
+
+
+def run():
+    for benchmark in BENCHMARKS:
+        print('\n{0}\n'.format(benchmark.__name__))
+        benchmark.run()
+
+
+if __name__ == '__main__':
+    run()
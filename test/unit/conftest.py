@@ -0,0 +1,28 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 ftrack
+
+import os
+import sys
+
+import pytest
+
+
+BENCHMARK_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', 'benchmark')
+)
+
+if BENCHMARK_PATH not in sys.path:
+    sys.path.insert(0, BENCHMARK_PATH)
+
+import harness
+
+if harness.PLUGIN_PATH not in sys.path:
+    sys.path.insert(0, harness.PLUGIN_PATH)
+
+
+@pytest.fixture()
+def plugin():
+    '''Return tuple of reset fake rv session and ftrack_rv_api module.'''
+    fake, api = harness.load_plugin()
+    harness.set_latency(0.0)
+    return fake, api
@@ -0,0 +1,104 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 ftrack
+
+import os
+
+import pytest
+
+import ftrack_cache
+
+
+class Clock(object):
+    '''Replacement for time.time returning a settable time.'''
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    '''Return clock used by ftrack_cache.'''
+    clock = Clock()
+    monkeypatch.setattr(ftrack_cache.time, 'time', clock)
+    return clock
+
+
+def test_set_and_get(tmpdir):
+    '''Return stored values and defaults for missing keys.'''
+    cache = ftrack_cache.PersistentCache(str(tmpdir.join('cache.db')))
+    cache.set_many({'a': 1, 'b': [1, 2]})
+
+    assert cache.get('a') == 1
+    assert cache.get('missing', 'default') == 'default'
+    assert cache.get_many(['a', 'b', 'missing']) == {'a': 1, 'b': [1, 2]}
+
+    cache.remove('a')
+    assert cache.items() == {'b': [1, 2]}
+
+
+def test_persisted(tmpdir):
+    '''Values are shared between caches at the same path.'''
+    path = str(tmpdir.join('cache.db'))
+    ftrack_cache.PersistentCache(path).set('a', 1)
+
+    assert ftrack_cache.PersistentCache(path).get('a') == 1
+
+
+def test_ttl(tmpdir, clock):
+    '''Entries older than ttl are missing and evicted on write.'''
+    cache = ftrack_cache.PersistentCache(str(tmpdir.join('cache.db')), ttl=10)
+    cache.set('old', 1)
+
+    clock.now += 5
+    cache.set('new', 2)
+    assert cache.get_many(['old', 'new']) == {'old': 1, 'new': 2}
+
+    clock.now += 6
+    assert cache.get('old') is None
+    assert cache.items() == {'new': 2}
+
+    cache.set('newest', 3)
+    rows = cache._connection.execute('SELECT key FROM cache').fetchall()
+    assert sorted(key for key, in rows) == ['new', 'newest']
+
+
+def test_ttl_not_extended_by_access(tmpdir, clock):
+    '''Reading an entry does not keep it alive past ttl.'''
+    cache = ftrack_cache.PersistentCache(str(tmpdir.join('cache.db')), ttl=10)
+    cache.set('a', 1)
+
+    clock.now += 8
+    assert cache.get('a') == 1
+
+    clock.now += 8
+    assert cache.get('a') is None
+
+
+def test_evict_least_recently_accessed(tmpdir, clock):
+    '''Entries beyond max_entries are evicted least recently used first.'''
+    cache = ftrack_cache.PersistentCache(
+        str(tmpdir.join('cache.db')), max_entries=2
+    )
+    cache.set('a', 1)
+    clock.now += 1
+    cache.set('b', 2)
+    clock.now += 1
+
+    # Reading a makes b the least recently used entry.
+    assert cache.get('a') == 1
+    clock.now += 1
+    cache.set('c', 3)
+
+    assert cache.items() == {'a': 1, 'c': 3}
+
+
+def test_invalid_value_not_stored(tmpdir):
+    '''Values that can not be encoded are not stored.'''
+    cache = ftrack_cache.PersistentCache(str(tmpdir.join('cache.db')))
+    cache.set('a', object())
+
+    assert cache.get('a') is None
+    assert os.path.exists(cache.path)
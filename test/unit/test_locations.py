@@ -0,0 +1,145 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 ftrack
+
+import os
+import time
+
+import pytest
+
+import harness
+import fake_ftrack_api
+
+import ftrack_cache
+
+
+def location(name, prefix):
+    '''Return location named *name* with an accessor at *prefix*.'''
+    accessor = fake_ftrack_api.NOT_SET
+    if prefix is not None:
+        accessor = fake_ftrack_api.Accessor(prefix)
+    return fake_ftrack_api.Location(None, {'id': name, 'name': name}, accessor)
+
+
+def test_probe_locations(plugin, tmpdir):
+    '''Only locations with a readable prefix are accessible.'''
+    fake, api = plugin
+    locations = [
+        location('disk', str(tmpdir)),
+        location('missing', str(tmpdir.join('missing'))),
+        location('server', None),
+    ]
+
+    latencies = api._probeLocations(locations)
+
+    assert latencies[0] is not None
+    assert latencies[1:] == [None, None]
+
+
+def test_probe_locations_in_parallel(plugin, tmpdir, monkeypatch):
+    '''Hung locations are given up on together after the timeout.'''
+    fake, api = plugin
+    hung = str(tmpdir.join('hung'))
+    isdir = os.path.isdir
+
+    def _isdir(path):
+        if path.startswith(hung):
+            time.sleep(1)
+        return isdir(path)
+
+    monkeypatch.setattr(api, 'LOCATION_PROBE_TIMEOUT', 0.2)
+    monkeypatch.setattr(api.os.path, 'isdir', _isdir)
+    locations = [
+        location('hung-{0}'.format(index), '{0}-{1}'.format(hung, index))
+        for index in range(3)
+    ] + [location('disk', str(tmpdir))]
+
+    start = time.time()
+    latencies = api._probeLocations(locations)
+
+    assert time.time() - start < 0.5
+    assert latencies[:3] == [None, None, None]
+    assert latencies[3] is not None
+
+
+@pytest.fixture()
+def paths(plugin, tmpdir, monkeypatch):
+    '''Return fake rv session and plugin persisting paths in *tmpdir*.
+
+    Returned paths are treated as existing.
+
+    '''
+    fake, api = plugin
+    monkeypatch.setattr(
+        api, 'componentPathCache', ftrack_cache.PersistentCache(
+            str(tmpdir.join('component_paths.db'))
+        )
+    )
+    monkeypatch.setattr(api, '_pathExists', lambda path: True)
+    return fake, api
+
+
+def set_latencies(monkeypatch, api, disk, remote):
+    '''Set probed read latency of the disk and remote locations.'''
+    latencies = None
+    if disk is not None:
+        latencies = [
+            (fake_ftrack_api.DISK_LOCATION_ID, 'studio.disk', 10, disk),
+            (fake_ftrack_api.REMOTE_LOCATION_ID, 'studio.remote', 20, remote),
+        ]
+    monkeypatch.setattr(api, 'locationLatencies', latencies)
+
+
+def new_session(api):
+    '''Forget paths resolved in this session.'''
+    api.componentFilesystemPaths.clear()
+    api.componentPathLocations.clear()
+
+
+def test_persisted_path(paths, monkeypatch):
+    '''Paths in the fastest location are used without round trips.'''
+    fake, api = paths
+    set_latencies(monkeypatch, api, 0.001, 0.1)
+    assert api._resolveFilePaths(['a']) == ['/mnt/projects/a.mov']
+
+    new_session(api)
+    trips = harness.round_trips()
+
+    assert api._resolveFilePaths(['a']) == ['/mnt/projects/a.mov']
+    assert api._getFilePath('a') == '/mnt/projects/a.mov'
+    assert harness.round_trips() == trips
+
+
+def test_persisted_path_ranked_again(paths, monkeypatch):
+    '''Persisted paths are resolved again once another location is faster.'''
+    fake, api = paths
+    set_latencies(monkeypatch, api, 0.001, 0.1)
+    api._resolveFilePaths(['a'])
+
+    new_session(api)
+    set_latencies(monkeypatch, api, 0.1, 0.001)
+
+    assert api._resolveFilePaths(['a']) == ['/mnt/remote/a.mov']
+
+
+def test_persisted_path_before_probing(paths, monkeypatch):
+    '''Paths picked before locations were probed are ranked later on.'''
+    fake, api = paths
+    set_latencies(monkeypatch, api, None, None)
+    assert api._resolveFilePaths(['a']) == ['/mnt/projects/a.mov']
+
+    new_session(api)
+    set_latencies(monkeypatch, api, 0.1, 0.001)
+
+    assert api._resolveFilePaths(['a']) == ['/mnt/remote/a.mov']
+
+
+def test_persisted_path_without_location(paths, monkeypatch):
+    '''Paths persisted without their location are resolved again.'''
+    fake, api = paths
+    set_latencies(monkeypatch, api, 0.001, 0.1)
+    api.componentPathCache.set('a', '/mnt/old/a.mov')
+
+    assert api._resolveFilePaths(['a']) == ['/mnt/projects/a.mov']
+    assert api.componentPathCache.get('a')['location'] == (
+        fake_ftrack_api.DISK_LOCATION_ID
+    )
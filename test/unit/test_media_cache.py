@@ -0,0 +1,99 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 ftrack
+
+import os
+import time
+
+import pytest
+
+import harness
+
+
+@pytest.fixture()
+def media(plugin, tmpdir):
+    '''Return fake rv session, plugin and a loaded playlist of media files.
+
+    Every item has 1024 bytes of media and the next item is prefetched into
+    a cache fitting two and a half items.
+
+    '''
+    fake, api = plugin
+    items = harness.playlist(4)
+
+    for item in items:
+        path = tmpdir.join('media', '{0}.mov'.format(item['componentId']))
+        path.write_binary(b'0' * 1024, ensure=True)
+        api.componentFilesystemPaths[item['componentId']] = str(path)
+
+    api.mediaCacheSettings = (1, str(tmpdir.join('cache')), 2.5 * 1024)
+    with harness.deferred(api):
+        api.loadPlaylist(items, quality='full')
+
+    return fake, api
+
+
+def prefetch(api, index):
+    '''Prefetch media following *index* and switch sources to the copies.'''
+    with harness.deferred(api) as dispatcher:
+        api._prefetchMedia(index)
+
+        end = time.time() + 10
+        while api.mediaCacheFutures:
+            assert time.time() < end, 'Timed out waiting for media copies.'
+            dispatcher.run_idle()
+            time.sleep(0.001)
+
+
+def source_media(fake, api, index):
+    '''Return media path of the source of playlist item *index*.'''
+    sourceGroup = api.playlistSourceGroups[index][1]
+    source, = [
+        node for node in fake.nodesInGroup(sourceGroup)
+        if fake.nodeType(node) == 'RVFileSource'
+    ]
+    return fake.sourceMedia(source)[0][0]
+
+
+def test_prefetch_switches_to_copy(media):
+    '''Sources of upcoming items are switched to their local copy.'''
+    fake, api = media
+    prefetch(api, 0)
+
+    path = source_media(fake, api, 1)
+    assert path == api.mediaCachePaths[api.componentFilesystemPaths[
+        api.playlistSourceGroups[1][0]
+    ]]
+    assert os.path.exists(path)
+
+
+def test_evict_keeps_copies_in_use(media):
+    '''Copies loaded sources were switched to are never evicted.'''
+    fake, api = media
+    prefetch(api, 0)
+    copy = source_media(fake, api, 1)
+
+    # Play on through item 1, the cache exceeds its size with item 3.
+    fake.setFrame(api._getPlaylistItemOffset(1) + 1)
+    prefetch(api, 1)
+    fake.setFrame(api._getPlaylistItemOffset(2) + 1)
+    prefetch(api, 2)
+
+    for index in (1, 2, 3):
+        assert os.path.exists(source_media(fake, api, index))
+    assert source_media(fake, api, 1) == copy
+
+
+def test_evict_copies_no_longer_loaded(media):
+    '''Copies of media no longer in the playlist are evicted.'''
+    fake, api = media
+    prefetch(api, 0)
+    copy = source_media(fake, api, 1)
+
+    items = harness.playlist(4)
+    with harness.deferred(api):
+        api.loadPlaylist(items[2:] + items[:1], quality='full')
+
+    prefetch(api, 0)
+    prefetch(api, 1)
+
+    assert not os.path.exists(copy)
@@ -0,0 +1,230 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 ftrack
+
+import pytest
+
+import harness
+
+
+def load(api, playlist, progressive=False, quality='full'):
+    '''Load *playlist*, running the idle steps of progressive loads.'''
+    with harness.deferred(api):
+        api.loadPlaylist(
+            playlist, progressive=progressive, quality=quality
+        )
+
+
+def component_ids(api):
+    '''Return component ids of the loaded playlist.'''
+    return [componentId for componentId, _ in api.playlistSourceGroups]
+
+
+def test_frame_offsets(plugin):
+    '''Offsets accumulate the frame count of every item.'''
+    fake, api = plugin
+    load(api, harness.playlist(3))
+
+    assert api.playlistFrameOffsets == [0, 48, 96, 144]
+    assert [api._getPlaylistItemOffset(index) for index in range(3)] == [
+        0, 48, 96
+    ]
+
+    # Indices out of range are clamped.
+    assert api._getPlaylistItemOffset(-1) == 0
+    assert api._getPlaylistItemOffset(10) == 144
+
+
+@pytest.mark.parametrize(('frame', 'expected'), [
+    (-5, 0),
+    (1, 0),
+    (48, 0),
+    (49, 1),
+    (96, 1),
+    (97, 2),
+    (144, 2),
+    (1000, 2),
+])
+def test_index_at_frame(plugin, frame, expected):
+    '''Return index of the item shown at sequence frame.'''
+    fake, api = plugin
+    load(api, harness.playlist(3))
+
+    assert api._getPlaylistIndexAtFrame(frame) == expected
+
+
+def test_index_at_frame_empty(plugin):
+    '''Return None without a loaded playlist.'''
+    fake, api = plugin
+
+    assert api._getPlaylistIndexAtFrame(1) is None
+
+
+def test_index_at_frame_skips_unloaded(plugin):
+    '''Items without a source group take up no frames.'''
+    fake, api = plugin
+    load(api, harness.playlist(2))
+    first, second = [
+        sourceGroup for _, sourceGroup in api.playlistSourceGroups
+    ]
+
+    api._setPlaylistSourceGroups(['a', 'b', 'c'], [first, None, second])
+
+    assert api.playlistFrameOffsets == [0, 48, 48, 96]
+    assert api._getPlaylistIndexAtFrame(48) == 0
+    assert api._getPlaylistIndexAtFrame(49) == 2
+
+
+def test_reuse_source_groups(plugin):
+    '''Reuse source groups in order and delete all others.'''
+    fake, api = plugin
+    load(api, [
+        {'componentId': 'a'}, {'componentId': 'b'}, {'componentId': 'a'}
+    ])
+    sourceGroups = [sourceGroup for _, sourceGroup in api.playlistSourceGroups]
+    unrelated = fake.newNode('RVSourceGroup')
+
+    reused = api._reuseSourceGroups(['a', 'c', 'a', 'a'])
+
+    assert reused == [sourceGroups[0], None, sourceGroups[2], None]
+    assert not fake.nodeExists(sourceGroups[1])
+    assert not fake.nodeExists(unrelated)
+    assert sorted(fake.nodesOfType('RVSourceGroup')) == sorted(
+        [sourceGroups[0], sourceGroups[2]]
+    )
+
+
+def test_reload_adds_only_new_items(plugin):
+    '''Reloading an edited playlist only adds sources for new items.'''
+    fake, api = plugin
+    items = harness.playlist(20)
+    load(api, items)
+    loaded = dict(api.playlistSourceGroups)
+
+    edited = list(items)
+    edited[::5] = harness.playlist(4, prefix='edited')
+    load(api, edited)
+
+    assert component_ids(api) == [item['componentId'] for item in edited]
+    for componentId, sourceGroup in api.playlistSourceGroups:
+        if componentId in loaded:
+            assert sourceGroup == loaded[componentId]
+        else:
+            assert sourceGroup not in loaded.values()
+    assert len(fake.nodesOfType('RVSourceGroup')) == 20
+
+
+@pytest.mark.parametrize('size', [1, 10, 100, 1000])
+def test_load_round_trips(plugin, size):
+    '''Progressive loads take the same round trips as loading at once.'''
+    fake, api = plugin
+    items = harness.playlist(size)
+
+    load(api, items, quality='auto')
+    batchTrips = harness.round_trips()
+    assert len(api.playlistSourceGroups) == size
+
+    harness.reset(fake, api)
+    load(api, items, progressive=True, quality='auto')
+    progressiveTrips = harness.round_trips()
+
+    assert len(api.playlistSourceGroups) == size
+    assert api.playlistFrameOffsets[-1] == size * fake.frames_per_source
+    assert progressiveTrips == batchTrips
+
+    # Paths are resolved in batches rather than per item.
+    assert batchTrips <= 4 * (size // api.COMPONENT_BATCH_SIZE + 1)
+
+
+@pytest.mark.parametrize('size', [11, 100, 1000])
+def test_progressive_load_rewires(plugin, size):
+    '''Progressive loads rewire the sequence a logarithmic number of times.'''
+    fake, api = plugin
+
+    with harness.deferred(api):
+        api.loadPlaylist(
+            harness.playlist(size), progressive=True, quality='full'
+        )
+
+        # Only the visible item is loaded before RV is idle.
+        assert len(fake.nodesOfType('RVSourceGroup')) == 1
+
+    batches = 0
+    loaded = 1
+    while loaded < size:
+        loaded += api.PROGRESSIVE_LOAD_BATCH_SIZE * 2 ** batches
+        batches += 1
+
+    # Every step rewires the sequence once for the added sources and once
+    # for the playlist order.
+    assert len(fake.nodesOfType('RVSourceGroup')) == size
+    assert fake.calls['setNodeInputs'] == 2 * (batches + 1)
+
+
+def test_view_playlist_item(plugin):
+    '''View the source group of a playlist item.'''
+    fake, api = plugin
+    load(api, harness.playlist(3))
+    sourceGroup = api.playlistSourceGroups[1][1]
+
+    assert api.ftrackViewPlaylistItem('1') == sourceGroup
+    assert fake.viewNode() == sourceGroup
+    assert api.ftrackViewPlaylistItem('3') == ''
+    assert fake.viewNode() == sourceGroup
+
+
+def test_playlist_index(plugin):
+    '''Return playlist index of the item loaded by a source.'''
+    fake, api = plugin
+    items = harness.playlist(3)
+    load(api, items)
+    first = api.playlistSourceGroups[0][1]
+
+    # Reused source groups are not in playlist order.
+    load(api, items[1:] + items[:1])
+
+    assert api.ftrackPlaylistIndex(first) == '2'
+    assert api.ftrackPlaylistIndex('{0}_source'.format(first)) == '2'
+    assert api.ftrackPlaylistIndex('missing') == ''
+
+
+def test_default_quality(plugin):
+    '''Long playlists load the requested components by default.'''
+    fake, api = plugin
+    items = harness.playlist(api.PROXY_PLAYLIST_SIZE)
+    load(api, items, quality=None)
+
+    assert component_ids(api) == [item['componentId'] for item in items]
+
+
+def test_inaccessible_proxies(plugin, monkeypatch):
+    '''Proxies without an accessible path are not resolved again.'''
+    fake, api = plugin
+    resolveFilePaths = api._resolveFilePaths
+    resolved = []
+
+    def _resolveFilePaths(componentIds):
+        resolved.extend(componentIds)
+        return [
+            None if componentId.endswith('-proxy') else path
+            for componentId, path in zip(
+                componentIds, resolveFilePaths(componentIds)
+            )
+        ]
+
+    monkeypatch.setattr(api, '_resolveFilePaths', _resolveFilePaths)
+    items = harness.playlist(3)
+
+    load(api, items, quality='proxy')
+    assert component_ids(api) == [item['componentId'] for item in items]
+    assert len([
+        componentId for componentId in resolved
+        if componentId.endswith('-proxy')
+    ]) == 3
+
+    del resolved[:]
+    trips = harness.round_trips()
+    load(api, items, quality='proxy')
+
+    assert component_ids(api) == [item['componentId'] for item in items]
+    assert not any(componentId.endswith('-proxy') for componentId in resolved)
+    assert harness.round_trips() == trips
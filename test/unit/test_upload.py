@@ -0,0 +1,182 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 ftrack
+
+import os
+import json
+
+import pytest
+
+import harness
+import fake_ftrack_api
+
+import ftrack_cache
+
+
+@pytest.fixture()
+def uploads(plugin, tmpdir, monkeypatch):
+    '''Return fake rv session, plugin and directory of exported frames.
+
+    Retries are not delayed and components are recorded in an upload index
+    in *tmpdir*.
+
+    '''
+    fake, api = plugin
+    directory = str(tmpdir.mkdir('export'))
+
+    monkeypatch.setattr(api, 'ftrackFilePath', lambda id: directory)
+    monkeypatch.setattr(api, 'UPLOAD_RETRY_DELAY', 0)
+    monkeypatch.setattr(api, 'uploadIndex', ftrack_cache.PersistentCache(
+        str(tmpdir.join('upload_index.db'))
+    ))
+    return fake, api, directory
+
+
+def write_frames(directory, contents):
+    '''Write a frame for each of *contents* and return their descriptions.'''
+    files = []
+    for frame, content in enumerate(contents, 1):
+        file_name = 'annotation_{0:04d}.jpg'.format(frame)
+        with open(os.path.join(directory, file_name), 'wb') as file:
+            file.write(content)
+        files.append({'file_name': file_name, 'frame': frame})
+    return files
+
+
+def send(fake, api, files):
+    '''Create and upload components for *files* and return their ids.'''
+    components = json.loads(api.create_components(json.dumps(files)))
+    ended = len(harness.ftrack_events(fake, 'uploadEnded'))
+    api.upload_components(json.dumps(components))
+    harness.wait_for_events(
+        fake, 'uploadEnded', ended + len(files), timeout=10
+    )
+    return [components[item['file_name']] for item in files]
+
+
+def fail_server_uploads(monkeypatch, count):
+    '''Fail the first *count* additions to the server location.'''
+    add_components = fake_ftrack_api.Location.add_components
+    failures = []
+
+    def _add_components(self, components, sources, recursive=True):
+        if (
+            self['id'] == fake_ftrack_api.SERVER_LOCATION_ID and
+            len(failures) < count
+        ):
+            failures.append(components)
+            raise IOError('Connection reset.')
+        return add_components(self, components, sources, recursive)
+
+    monkeypatch.setattr(
+        fake_ftrack_api.Location, 'add_components', _add_components
+    )
+    return failures
+
+
+def test_upload(uploads):
+    '''Uploaded frames are removed and reported as ended.'''
+    fake, api, directory = uploads
+    files = write_frames(directory, [b'a', b'b'])
+
+    componentIds = send(fake, api, files)
+
+    ended = harness.ftrack_events(fake, 'uploadEnded')
+    assert sorted(event['id'] for event in ended) == sorted(componentIds)
+    assert all(event['success'] for event in ended)
+    assert os.listdir(directory) == []
+
+
+def test_upload_retry(uploads, monkeypatch):
+    '''Failed uploads are retried, tolerating the registered origin.'''
+    fake, api, directory = uploads
+    failures = fail_server_uploads(monkeypatch, 2)
+
+    componentId, = send(fake, api, write_frames(directory, [b'a']))
+
+    assert len(failures) == 2
+    retrying = [
+        event['attempt']
+        for event in harness.ftrack_events(fake, 'uploadProgress')
+        if event['status'] == 'retrying'
+    ]
+    assert retrying == [1, 2]
+    assert harness.ftrack_events(fake, 'uploadFailed') == []
+    assert harness.ftrack_events(fake, 'uploadEnded') == [
+        {'type': 'uploadEnded', 'id': componentId, 'success': True}
+    ]
+
+
+def test_upload_failed(uploads, monkeypatch):
+    '''Uploads failing every attempt are reported as failed.'''
+    fake, api, directory = uploads
+    monkeypatch.setattr(api, 'UPLOAD_RETRIES', 2)
+    failures = fail_server_uploads(monkeypatch, 3)
+
+    componentId, = send(fake, api, write_frames(directory, [b'a']))
+
+    assert len(failures) == 3
+    assert harness.ftrack_events(fake, 'uploadFailed') == [
+        {'type': 'uploadFailed', 'id': componentId}
+    ]
+    assert harness.ftrack_events(fake, 'uploadEnded') == [
+        {'type': 'uploadEnded', 'id': componentId, 'success': False}
+    ]
+
+    # Frames are kept to upload later.
+    assert os.listdir(directory) == ['annotation_0001.jpg']
+
+
+def test_upload_reuses_component(uploads):
+    '''Frames with uploaded content reuse the uploaded component.'''
+    fake, api, directory = uploads
+    componentIds = send(fake, api, write_frames(directory, [b'a', b'b']))
+
+    fake.events = []
+    resent = send(fake, api, write_frames(directory, [b'b', b'c']))
+
+    assert resent[0] == componentIds[1]
+    assert resent[1] not in componentIds
+
+    reused = [
+        event['id'] for event in harness.ftrack_events(fake, 'uploadProgress')
+        if event.get('reused')
+    ]
+    assert reused == [componentIds[1]]
+    assert all(
+        event['success']
+        for event in harness.ftrack_events(fake, 'uploadEnded')
+    )
+    assert os.listdir(directory) == []
+
+    # Only the new frame is uploaded.
+    uploading = [
+        event['id'] for event in harness.ftrack_events(fake, 'uploadProgress')
+        if event['status'] == 'uploading'
+    ]
+    assert uploading == [resent[1]]
+
+
+def test_upload_same_content_in_batch(uploads):
+    '''Frames with the same content sent together are each uploaded.'''
+    fake, api, directory = uploads
+    send(fake, api, write_frames(directory, [b'a']))
+
+    componentIds = send(fake, api, write_frames(directory, [b'a', b'a']))
+
+    assert len(set(componentIds)) == 2
+    reused = [
+        event['id'] for event in harness.ftrack_events(fake, 'uploadProgress')
+        if event.get('reused')
+    ]
+    assert reused == [componentIds[0]]
+
+
+def test_upload_index_ignores_other_servers(uploads, monkeypatch):
+    '''Components uploaded to another server are not reused.'''
+    fake, api, directory = uploads
+    componentId, = send(fake, api, write_frames(directory, [b'a']))
+
+    monkeypatch.setenv('FTRACK_SERVER', 'https://other.example.com')
+    resent, = send(fake, api, write_frames(directory, [b'a']))
+
+    assert resent != componentId